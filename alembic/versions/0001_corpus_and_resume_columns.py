@@ -0,0 +1,77 @@
+"""Bring a database created by create_all before migrations existed up to date.
+
+Adds the job corpus, near-duplicate and resume columns to existing tables,
+creates the newer tables, and backfills job_scopes from jobs.domain /
+jobs.search_location. Every step checks the live schema first, so this is a
+no-op on a database that create_all built from the current models.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.database import Base
+import app.models  # noqa: F401
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+NEW_TABLES = ("scrape_watermarks", "match_scores", "recommended_jobs", "resume_analyses", "cover_letters", "job_scopes")
+
+COLUMNS = {
+    "jobs": [
+        (sa.Column("domain", sa.String(100), nullable=True), True),
+        (sa.Column("search_location", sa.String(255), nullable=True), True),
+        (sa.Column("simhash", sa.String(16), nullable=True), False),
+        (sa.Column("simhash_band_0", sa.Integer, nullable=True), True),
+        (sa.Column("simhash_band_1", sa.Integer, nullable=True), True),
+        (sa.Column("simhash_band_2", sa.Integer, nullable=True), True),
+        (sa.Column("simhash_band_3", sa.Integer, nullable=True), True),
+    ],
+    "resumes": [
+        (sa.Column("content_hash", sa.String(64), nullable=True), True),
+        (sa.Column("structured_data", sa.JSON, nullable=True), False),
+    ],
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    # Creates the newer tables (or the whole schema on an empty database); existing
+    # tables are left alone and patched column by column below.
+    Base.metadata.create_all(bind)
+
+    inspector = sa.inspect(bind)
+    for table, columns in COLUMNS.items():
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        indexes = {index["name"] for index in inspector.get_indexes(table)}
+        for column, indexed in columns:
+            if column.name not in existing:
+                op.add_column(table, column)
+            if indexed and f"ix_{table}_{column.name}" not in indexes:
+                op.create_index(f"ix_{table}_{column.name}", table, [column.name])
+    if "ix_jobs_application_url" not in {index["name"] for index in inspector.get_indexes("jobs")}:
+        op.create_index("ix_jobs_application_url", "jobs", ["application_url"])
+
+    op.execute(
+        """
+        INSERT INTO job_scopes (job_id, domain, location, scraped_at)
+        SELECT id, domain, search_location, scraped_at FROM jobs
+        WHERE domain IS NOT NULL AND search_location IS NOT NULL
+          AND id NOT IN (SELECT job_id FROM job_scopes)
+        """
+    )
+
+
+def downgrade():
+    for name in reversed(NEW_TABLES):
+        op.drop_table(name)
+    for table, columns in COLUMNS.items():
+        with op.batch_alter_table(table) as batch:
+            for column, indexed in columns:
+                if indexed:
+                    batch.drop_index(f"ix_{table}_{column.name}")
+                batch.drop_column(column.name)
@@ -6,6 +6,8 @@ from playwright.async_api import async_playwright, Page, Browser
 from openai import AsyncOpenAI
 from loguru import logger
 from app.config import settings
+from app.agents.llm_scheduler import Priority, llm_scheduler
+from app.agents.resume_structure import known_field_value, resume_excerpt
 
 
 class NeedsInfoException(Exception):
@@ -17,7 +19,7 @@ class NeedsInfoException(Exception):
 
 class AutoApplyAgent:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
         self.model = settings.OPENAI_MODEL
 
     async def _get_page_context(self, page: Page) -> str:
@@ -33,18 +35,32 @@ class AutoApplyAgent:
                 fields.append(f"- [{input_type}] name='{name}' label='{label or aria_label}'")
         return "\n".join(fields) if fields else "No visible input fields found."
 
-    async def _ai_fill_decision(self, field_label: str, field_type: str, profile: dict, resume_text: str, user_answers: dict) -> dict:
+    async def _ai_fill_decision(
+        self,
+        field_label: str,
+        field_type: str,
+        profile: dict,
+        resume_text: str,
+        user_answers: dict,
+        resume_data: Optional[dict] = None,
+    ) -> dict:
         if field_label.lower() in [k.lower() for k in user_answers]:
             matched_key = next(k for k in user_answers if k.lower() == field_label.lower())
             return {"action": "fill", "value": user_answers[matched_key]}
 
+        known = known_field_value(field_label, field_type, profile, resume_data)
+        if known:
+            return {"action": "fill", "value": known}
+
+        excerpt = resume_excerpt(resume_data, resume_text, ("summary", "education", "experience"), 1000, focus=field_label)
+
         prompt = f"""You are an AI agent filling out a job application form on behalf of a student.
 
 Student Profile:
 {json.dumps(profile, indent=2)}
 
 Resume excerpt:
-{resume_text[:1500]}
+{excerpt}
 
 Previously answered questions:
 {json.dumps(user_answers, indent=2)}
@@ -69,7 +85,9 @@ Rules:
 - For email: use email from profile
 - For experience years: derive from experience_level (fresher=0, entry_level=1, mid_level=3)"""
 
-        response = await self.client.chat.completions.create(
+        response = await llm_scheduler.chat(
+            self.client,
+            Priority.INTERACTIVE,
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.1,
@@ -94,6 +112,7 @@ Rules:
         user_answers: dict = None,
         resume_file_path: str = None,
         notify_callback=None,
+        resume_data: Optional[dict] = None,
     ) -> dict:
         user_answers = user_answers or {}
         result = {
@@ -146,7 +165,9 @@ Rules:
                             if current_value:
                                 continue
 
-                            decision = await self._ai_fill_decision(field_label, field_type, profile, resume_text, user_answers)
+                            decision = await self._ai_fill_decision(
+                                field_label, field_type, profile, resume_text, user_answers, resume_data
+                            )
 
                             if decision["action"] == "fill":
                                 value = str(decision.get("value", ""))
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import dialect_insert
+from app.models.cover_letter import CoverLetter
+from app.agents.score_cache import fingerprint
+
+
+def cover_letter_key(resume, job) -> Tuple[str, str]:
+    resume_hash = resume.content_hash or fingerprint(resume.raw_text or "")
+    job_hash = fingerprint(f"{job.title}\n{job.company}\n{job.description or ''}")
+    return resume_hash, job_hash
+
+
+class CoverLetterCache:
+    def __init__(self, db: AsyncSession, user_id: int, model: str):
+        self.db = db
+        self.user_id = user_id
+        self.model = model
+
+    async def _row(self, resume_hash: str, job_hash: str) -> Optional[CoverLetter]:
+        result = await self.db.execute(
+            select(CoverLetter).where(
+                CoverLetter.user_id == self.user_id,
+                CoverLetter.resume_hash == resume_hash,
+                CoverLetter.job_hash == job_hash,
+                CoverLetter.model == self.model,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get(self, resume_hash: str, job_hash: str) -> Optional[str]:
+        row = await self._row(resume_hash, job_hash)
+        return row.text if row else None
+
+    async def put(self, resume_hash: str, job_hash: str, text: str):
+        stmt = dialect_insert(CoverLetter).values(
+            user_id=self.user_id, resume_hash=resume_hash, job_hash=job_hash, model=self.model,
+            text=text, created_at=datetime.now(timezone.utc),
+        )
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id", "resume_hash", "job_hash", "model"],
+            set_={"text": stmt.excluded.text, "created_at": stmt.excluded.created_at},
+        ))
@@ -5,6 +5,7 @@ from typing import List, Optional
 from openai import AsyncOpenAI
 from loguru import logger
 from app.config import settings
+from app.agents.llm_scheduler import Priority, llm_scheduler
 
 
 class EmailClassification:
@@ -18,7 +19,7 @@ class EmailClassification:
 
 class EmailAgent:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
         self.model = settings.OPENAI_MODEL
 
     async def classify_email(self, subject: str, body: str, sender: str) -> dict:
@@ -49,7 +50,9 @@ Classify this email and return JSON only:
 }}"""
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await llm_scheduler.chat(
+                self.client,
+                Priority.BACKGROUND,
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.1,
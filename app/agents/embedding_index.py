@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+import numpy as np
+from loguru import logger
+from app.agents.lexical_ranker import tokenize
+from app.config import settings
+from app.scrapers.dedup import job_signature, to_hex
+from app.scrapers.scraped_job import ScrapedJob
+
+
+class Embedder(Protocol):
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        ...
+
+
+class HashingEmbedder:
+    # Signed feature hashing of word unigrams, bigrams and character trigrams,
+    # with sublinear term frequency. Deterministic across processes and runs,
+    # so vectors persisted by one worker stay valid for the next.
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim or settings.EMBEDDING_DIM
+        self.name = f"hashing-v1-{self.dim}"
+
+    def _features(self, text: str) -> Counter:
+        tokens = tokenize(text)
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        for token in tokens:
+            if len(token) > 3:
+                padded = f"<{token}>"
+                features.update(f"#{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            hashes = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.uint32, count=len(features))
+            weights = 1.0 + np.log(np.fromiter(features.values(), dtype=np.float32, count=len(features)))
+            weights[hashes < 0x80000000] *= -1
+            np.add.at(vectors[row], hashes % self.dim, weights)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+def job_text(job: ScrapedJob) -> str:
+    return "\n".join([
+        job.title, job.title, " ".join(job.requirements or []), (job.description or "")[:3000],
+    ])
+
+
+def profile_text(profile, resume_text: str = "") -> str:
+    domain = str(getattr(profile.domain, "value", profile.domain) or "").replace("_", " ")
+    skills = " ".join(profile.skills or [])
+    roles = " ".join(profile.target_roles or [])
+    return "\n".join([skills, skills, roles, roles, domain, (resume_text or "")[:5000]])
+
+
+def _fingerprint(value: Optional[str]) -> int:
+    return int(value, 16) if value else 0
+
+
+class EmbeddingIndex:
+    # Row-aligned job vectors, job ids and content fingerprints (the job's simhash),
+    # each kept as a memory-mapped .npy file with spare capacity so ingestion can
+    # append without rewriting the matrix. The fingerprint catches a row whose id
+    # now belongs to a different posting, e.g. after the database was reset.
+    # Writes may run in worker threads; the lock covers the files and the row map.
+    def __init__(self, directory: Optional[str] = None, embedder: Optional[Embedder] = None):
+        self.directory = directory or settings.EMBEDDING_INDEX_DIR
+        self.embedder = embedder or HashingEmbedder()
+        self.vectors: Optional[np.ndarray] = None
+        self.ids: Optional[np.ndarray] = None
+        self.fingerprints: Optional[np.ndarray] = None
+        self.count = 0
+        self._rows: Dict[int, int] = {}
+        self._lock = threading.RLock()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def load(self):
+        with self._lock:
+            self._load()
+
+    def _load(self):
+        if self.vectors is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(self._path("meta.json")) as f:
+                meta = json.load(f)
+            if meta["embedder"] != self.embedder.name:
+                raise ValueError(f"index built with {meta['embedder']}")
+            self.vectors = np.load(self._path("vectors.npy"), mmap_mode="r+")
+            self.ids = np.load(self._path("ids.npy"), mmap_mode="r+")
+            self.fingerprints = np.load(self._path("fingerprints.npy"), mmap_mode="r+")
+            self.count = min(int(meta["count"]), len(self.ids), len(self.fingerprints))
+        except FileNotFoundError:
+            self._allocate(0)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Rebuilding embedding index: {e}")
+            self._allocate(0)
+        self._rows = {int(job_id): row for row, job_id in enumerate(self.ids[:self.count])}
+        logger.info(f"Embedding index loaded with {self.count} jobs")
+
+    def _allocate(self, capacity: int):
+        capacity = max(capacity, 1024)
+        shapes = {
+            "vectors": (np.float32, (capacity, self.embedder.dim)),
+            "ids": (np.int64, (capacity,)),
+            "fingerprints": (np.uint64, (capacity,)),
+        }
+        grown = {
+            name: np.lib.format.open_memmap(self._path(f"{name}.npy.part"), mode="w+", dtype=dtype, shape=shape)
+            for name, (dtype, shape) in shapes.items()
+        }
+        if self.vectors is not None and self.count:
+            for name, array in grown.items():
+                array[:self.count] = getattr(self, name)[:self.count]
+        else:
+            self.count = 0
+        for name in shapes:
+            grown[name].flush()
+        del grown
+        self.vectors = self.ids = self.fingerprints = None
+        for name in shapes:
+            os.replace(self._path(f"{name}.npy.part"), self._path(f"{name}.npy"))
+        for name in shapes:
+            setattr(self, name, np.load(self._path(f"{name}.npy"), mmap_mode="r+"))
+        self._write_meta()
+
+    def _write_meta(self):
+        tmp = self._path("meta.json.part")
+        with open(tmp, "w") as f:
+            json.dump({"embedder": self.embedder.name, "dim": self.embedder.dim, "count": self.count}, f)
+        os.replace(tmp, self._path("meta.json"))
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._rows
+
+    def missing(self, fingerprints: Dict[int, Optional[str]]) -> List[int]:
+        # Ids that are not indexed, or whose stored vector was built from other content.
+        self.load()
+        with self._lock:
+            return [
+                job_id
+                for job_id, fingerprint in fingerprints.items()
+                if job_id not in self._rows
+                or int(self.fingerprints[self._rows[job_id]]) != _fingerprint(fingerprint)
+            ]
+
+    def upsert(self, jobs: Sequence[Tuple[int, ScrapedJob]], fingerprints: Optional[Sequence[Optional[str]]] = None):
+        # fingerprints are the stored Job.simhash values; computed from the jobs if omitted.
+        if not jobs:
+            return
+        self.load()
+        if fingerprints is None:
+            fingerprints = [to_hex(job_signature(job)) for _, job in jobs]
+        vectors = self.embedder.embed([job_text(job) for _, job in jobs])
+        with self._lock:
+            new_ids = {job_id for job_id, _ in jobs if job_id not in self._rows}
+            if self.count + len(new_ids) > len(self.ids):
+                self._allocate(max(2 * len(self.ids), self.count + len(new_ids)))
+            for (job_id, _), fingerprint, vector in zip(jobs, fingerprints, vectors):
+                row = self._rows.get(job_id)
+                if row is None:
+                    row = self._rows[job_id] = self.count
+                    self.ids[row] = job_id
+                    self.count += 1
+                self.vectors[row] = vector
+                self.fingerprints[row] = _fingerprint(fingerprint)
+            self.vectors.flush()
+            self.ids.flush()
+            self.fingerprints.flush()
+            self._write_meta()
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self.embedder.embed([text])[0]
+
+    def top_k(self, query: np.ndarray, k: int, job_ids: Optional[Iterable[int]] = None) -> List[Tuple[int, float]]:
+        self.load()
+        with self._lock:
+            return self._top_k(query, k, job_ids)
+
+    def _top_k(self, query: np.ndarray, k: int, job_ids: Optional[Iterable[int]]) -> List[Tuple[int, float]]:
+        if job_ids is None:
+            rows = np.arange(self.count)
+            scores = self.vectors[:self.count] @ query
+        else:
+            rows = np.fromiter((self._rows[i] for i in job_ids if i in self._rows), dtype=np.int64)
+            scores = self.vectors[rows] @ query
+        if not len(rows) or k <= 0:
+            return []
+        if k < len(rows):
+            best = np.argpartition(scores, -k)[-k:]
+        else:
+            best = np.arange(len(rows))
+        best = best[np.argsort(scores[best])[::-1]]
+        return [(int(self.ids[rows[i]]), float(scores[i])) for i in best]
+
+
+embedding_index = EmbeddingIndex()
@@ -1,16 +1,33 @@
 import json
+from loguru import logger
 from openai import AsyncOpenAI
 from app.config import settings
+from app.agents.lexical_ranker import rank_jobs
+from app.agents.llm_scheduler import Priority, llm_scheduler
+from app.agents.resume_structure import resume_excerpt
+from app.agents.score_cache import MatchScoreCache, fingerprint
 from app.scrapers.job_scraper import ScrapedJob
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+BATCH_PROMPT_TOKENS = 250
+BATCH_RESULT_TOKENS = 150
+
+
+def parse_match_score(value) -> int:
+    # The model occasionally returns "85", "85%" or prose instead of a number.
+    try:
+        return int(float(str(value or 0).strip().rstrip("%")))
+    except ValueError:
+        logger.warning(f"Unparseable match score {value!r}, using 0")
+        return 0
 
 
 class JobMatcherAgent:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
         self.model = settings.OPENAI_MODEL
 
-    async def score_job(self, job: ScrapedJob, profile, resume_text: str = "") -> dict:
+    def _profile_summary(self, profile, resume_text: str = "", resume_data: Optional[dict] = None) -> str:
         profile_summary = f"""
 Student Profile:
 - Name: {getattr(profile, 'user', None) and profile.user.full_name or 'Student'}
@@ -20,10 +37,13 @@ Student Profile:
 - Target Roles: {", ".join(profile.target_roles or [])}
 - Projects: {len(profile.projects or [])} project(s)
 """
-        if resume_text:
-            profile_summary += f"\nResume Excerpt:\n{resume_text[:1500]}"
+        excerpt = resume_excerpt(resume_data, resume_text, ("summary", "experience", "projects"), 1200)
+        if excerpt:
+            profile_summary += f"\nResume Excerpt:\n{excerpt}"
+        return profile_summary
 
-        job_info = f"""
+    def _job_info(self, job: ScrapedJob) -> str:
+        return f"""
 Job Title: {job.title}
 Company: {job.company}
 Location: {job.location}
@@ -32,6 +52,21 @@ Description: {job.description[:1000]}
 Requirements: {", ".join(job.requirements[:10]) if job.requirements else "N/A"}
 """
 
+    def _fallback_score(self, error: Exception) -> dict:
+        return {
+            "match_score": 50,
+            "match_reasons": ["Unable to fully analyze"],
+            "missing_skills": [],
+            "apply_recommendation": "good_match",
+            "summary": f"AI analysis unavailable: {str(error)}",
+            "keywords_matched": [],
+            # Placeholder, not a real score: callers that persist results skip these.
+            "fallback": True,
+        }
+
+    async def _request_score(
+        self, profile_summary: str, job_info: str, priority: Priority = Priority.DEFAULT
+    ) -> dict:
         prompt = f"""You are a career counselor AI that matches students to job opportunities.
 
 {profile_summary}
@@ -48,48 +83,201 @@ Analyze how well this job matches the student's profile. Return JSON only:
     "keywords_matched": ["<keyword 1>", "<keyword 2>"]
 }}"""
 
+        response = await llm_scheduler.chat(
+            self.client,
+            priority,
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            response_format={"type": "json_object"},
+        )
+        return json.loads(response.choices[0].message.content)
+
+    async def _request_batch(
+        self, profile_summary: str, job_infos: Dict[str, str], priority: Priority = Priority.DEFAULT
+    ) -> Dict[str, dict]:
+        jobs_block = "\n".join(f"### Job ID: {job_id}{info}" for job_id, info in job_infos.items())
+        prompt = f"""You are a career counselor AI that matches students to job opportunities.
+
+{profile_summary}
+
+Jobs:
+{jobs_block}
+
+Analyze how well each job matches the student's profile, independently of the other jobs.
+Return JSON only, with exactly one entry per Job ID:
+{{
+    "results": [
+        {{
+            "job_id": "<Job ID>",
+            "match_score": <integer 0-100>,
+            "match_reasons": ["<reason 1>", "<reason 2>", "<reason 3>"],
+            "missing_skills": ["<skill they lack>"],
+            "apply_recommendation": "strong_match|good_match|stretch_goal|not_recommended",
+            "summary": "<1-2 sentence summary of fit>",
+            "keywords_matched": ["<keyword 1>", "<keyword 2>"]
+        }}
+    ]
+}}"""
+
+        response = await llm_scheduler.chat(
+            self.client,
+            priority,
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            response_format={"type": "json_object"},
+        )
+        payload = json.loads(response.choices[0].message.content)
+        results = {}
+        for item in payload.get("results", []):
+            if isinstance(item, dict) and str(item.get("job_id")) in job_infos:
+                results[str(item["job_id"])] = item
+        return results
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        return len(text) // 4 + 1
+
+    def _plan_batches(self, profile_summary: str, job_infos: Dict[str, str]) -> List[List[str]]:
+        overhead = self._estimate_tokens(profile_summary) + BATCH_PROMPT_TOKENS
+        batches, current, used = [], [], overhead
+        for job_id, info in job_infos.items():
+            cost = self._estimate_tokens(info) + BATCH_RESULT_TOKENS
+            full = len(current) >= settings.MATCHER_BATCH_SIZE or used + cost > settings.MATCHER_BATCH_TOKEN_BUDGET
+            if current and full:
+                batches.append(current)
+                current, used = [], overhead
+            current.append(job_id)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _score_group(
+        self, profile_summary: str, job_infos: Dict[str, str], priority: Priority = Priority.DEFAULT
+    ) -> Dict[str, Tuple[dict, bool]]:
+        import asyncio
+
+        results = {}
+        if len(job_infos) > 1:
+            # Jobs are labelled 1..N in the prompt rather than by their content hash to keep it short.
+            labels = {str(i): key for i, key in enumerate(job_infos, 1)}
+            try:
+                batch = await self._request_batch(
+                    profile_summary, {label: job_infos[key] for label, key in labels.items()}, priority
+                )
+                results = {labels[label]: result for label, result in batch.items()}
+                if len(results) < len(job_infos):
+                    logger.warning(f"Batched scoring returned {len(results)}/{len(job_infos)} jobs, scoring the rest individually")
+            except Exception as e:
+                logger.warning(f"Batched scoring of {len(job_infos)} jobs failed, scoring individually: {e}")
+
+        async def score_single(key: str):
+            try:
+                return key, await self._request_score(profile_summary, job_infos[key], priority), True
+            except Exception as e:
+                return key, self._fallback_score(e), False
+
+        scored = {key: (result, True) for key, result in results.items()}
+        for key, result, ok in await asyncio.gather(*[score_single(k) for k in job_infos if k not in results]):
+            scored[key] = (result, ok)
+        return scored
+
+    def _result_row(self, job: ScrapedJob, lexical_score: float, result: dict) -> dict:
+        return {
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "job_type": job.job_type,
+            "description": job.description,
+            "application_url": job.application_url,
+            "source": job.source,
+            "posted_at": job.posted_at.isoformat() if job.posted_at else None,
+            "requirements": job.requirements,
+            "match_score": parse_match_score(result.get("match_score")),
+            "match_reasons": result.get("match_reasons", []),
+            "missing_skills": result.get("missing_skills", []),
+            "apply_recommendation": result.get("apply_recommendation", "good_match"),
+            "match_summary": result.get("summary", ""),
+            "keywords_matched": result.get("keywords_matched", []),
+            "lexical_score": round(lexical_score, 3),
+            "fallback": result.get("fallback", False),
+        }
+
+    async def score_job(
+        self, job: ScrapedJob, profile, resume_text: str = "", resume_data: Optional[dict] = None
+    ) -> dict:
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,
-                response_format={"type": "json_object"},
-            )
-            return json.loads(response.choices[0].message.content)
+            return await self._request_score(self._profile_summary(profile, resume_text, resume_data), self._job_info(job))
         except Exception as e:
-            return {
-                "match_score": 50,
-                "match_reasons": ["Unable to fully analyze"],
-                "missing_skills": [],
-                "apply_recommendation": "good_match",
-                "summary": f"AI analysis unavailable: {str(e)}",
-                "keywords_matched": [],
-            }
-
-    async def batch_score_jobs(self, jobs: List[ScrapedJob], profile, resume_text: str = "", top_n: int = 10) -> List[dict]:
+            return self._fallback_score(e)
+
+    async def stream_score_jobs(
+        self,
+        jobs: List[ScrapedJob],
+        profile,
+        resume_text: str = "",
+        shortlist_k: Optional[int] = None,
+        cache: Optional[MatchScoreCache] = None,
+        priority: Priority = Priority.DEFAULT,
+        resume_data: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
         import asyncio
 
-        async def score_one(job):
-            result = await self.score_job(job, profile, resume_text)
-            return {
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "job_type": job.job_type,
-                "description": job.description,
-                "application_url": job.application_url,
-                "source": job.source,
-                "posted_at": job.posted_at.isoformat() if job.posted_at else None,
-                "requirements": job.requirements,
-                "match_score": result.get("match_score", 0),
-                "match_reasons": result.get("match_reasons", []),
-                "missing_skills": result.get("missing_skills", []),
-                "apply_recommendation": result.get("apply_recommendation", "good_match"),
-                "match_summary": result.get("summary", ""),
-                "keywords_matched": result.get("keywords_matched", []),
-            }
-
-        scored = await asyncio.gather(*[score_one(job) for job in jobs[:20]], return_exceptions=True)
-        valid = [s for s in scored if isinstance(s, dict)]
-        valid.sort(key=lambda x: x["match_score"], reverse=True)
-        return valid[:top_n]
+        shortlist = rank_jobs(jobs, profile, resume_text)[:shortlist_k or settings.MATCHER_SHORTLIST_K]
+
+        profile_summary = self._profile_summary(profile, resume_text, resume_data)
+        profile_hash = fingerprint(f"{self.model}\n{profile_summary}")
+        job_infos: Dict[str, str] = {}
+        by_hash: Dict[str, List[Tuple[ScrapedJob, float]]] = {}
+        for job, lexical_score in shortlist:
+            job_info = self._job_info(job)
+            job_hash = fingerprint(job_info)
+            job_infos[job_hash] = job_info
+            by_hash.setdefault(job_hash, []).append((job, lexical_score))
+
+        cached = await cache.get_many(profile_hash, list(job_infos)) if cache else {}
+        for job_hash, result in cached.items():
+            for job, lexical_score in by_hash[job_hash]:
+                yield self._result_row(job, lexical_score, result)
+
+        pending = {h: info for h, info in job_infos.items() if h not in cached}
+        tasks = [
+            asyncio.ensure_future(self._score_group(profile_summary, {h: pending[h] for h in batch}, priority))
+            for batch in self._plan_batches(profile_summary, pending)
+        ]
+        fresh = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for job_hash, (result, ok) in (await next_done).items():
+                    if ok:
+                        fresh[job_hash] = result
+                    for job, lexical_score in by_hash[job_hash]:
+                        yield self._result_row(job, lexical_score, result)
+        finally:
+            # Stop outstanding requests if the consumer goes away mid-stream.
+            for task in tasks:
+                task.cancel()
+        if cache:
+            await cache.put_many(profile_hash, fresh)
+
+    async def batch_score_jobs(
+        self,
+        jobs: List[ScrapedJob],
+        profile,
+        resume_text: str = "",
+        top_n: int = 10,
+        shortlist_k: Optional[int] = None,
+        cache: Optional[MatchScoreCache] = None,
+        priority: Priority = Priority.DEFAULT,
+        resume_data: Optional[dict] = None,
+    ) -> List[dict]:
+        scored = [
+            row
+            async for row in self.stream_score_jobs(
+                jobs, profile, resume_text, shortlist_k, cache, priority, resume_data=resume_data
+            )
+        ]
+        scored.sort(key=lambda x: x["match_score"], reverse=True)
+        return scored[:top_n]
@@ -0,0 +1,71 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+from app.scrapers.scraped_job import ScrapedJob
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or our that the their this to we
+will with you your they them who what when where which while about into over than then there these
+those us can all any also more most other such only own same so very just not no nor too was were
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def job_tokens(job: ScrapedJob) -> List[str]:
+    title = tokenize(job.title)
+    return title + title + tokenize(job.description) + tokenize(" ".join(job.requirements or []))
+
+
+def profile_query(profile, resume_text: str = "") -> Dict[str, float]:
+    query: Counter = Counter()
+    for skill in profile.skills or []:
+        for token in tokenize(skill):
+            query[token] += 3.0
+    for role in profile.target_roles or []:
+        for token in tokenize(role):
+            query[token] += 2.0
+    for token in tokenize(str(getattr(profile.domain, "value", profile.domain) or "").replace("_", " ")):
+        query[token] += 1.0
+    for token, count in Counter(tokenize(resume_text[:5000])).items():
+        query[token] += min(count, 3) * 0.5
+    return dict(query)
+
+
+class BM25Index:
+    def __init__(self, documents: Iterable[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(doc) for doc in documents]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        doc_freq: Counter = Counter()
+        for tf in self.term_freqs:
+            doc_freq.update(tf.keys())
+        n = len(self.term_freqs)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+
+    def score(self, query: Dict[str, float]) -> List[float]:
+        terms = [(term, weight, self.idf[term]) for term, weight in query.items() if term in self.idf]
+        scores = []
+        for tf, length in zip(self.term_freqs, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            total = 0.0
+            for term, weight, idf in terms:
+                freq = tf.get(term)
+                if freq:
+                    total += weight * idf * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(total)
+        return scores
+
+
+def rank_jobs(jobs: List[ScrapedJob], profile, resume_text: str = "") -> List[Tuple[ScrapedJob, float]]:
+    if not jobs:
+        return []
+    scores = BM25Index(job_tokens(job) for job in jobs).score(profile_query(profile, resume_text))
+    order = sorted(range(len(jobs)), key=lambda i: scores[i], reverse=True)
+    return [(jobs[i], scores[i]) for i in order]
@@ -0,0 +1,210 @@
+import asyncio
+import enum
+import heapq
+import itertools
+import random
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+import openai
+from loguru import logger
+from app.config import settings
+from app.scrapers.circuit_breaker import parse_retry_after
+
+
+class Priority(enum.IntEnum):
+    INTERACTIVE = 0
+    DEFAULT = 1
+    BACKGROUND = 2
+
+
+class MinuteBudget:
+    # Token bucket refilled continuously at capacity/60 per second. Balances may
+    # go negative when a response used more than was reserved for it.
+    def __init__(self, per_minute: float):
+        self.capacity = max(float(per_minute), 1.0)
+        self.rate = self.capacity / 60.0
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.available >= amount else (amount - self.available) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        self._refill()
+        self.available = min(self.capacity, self.available - amount)
+
+
+def estimate_tokens(messages: List[dict], max_tokens: Optional[int] = None) -> int:
+    prompt = sum(len(str(m.get("content") or "")) for m in messages) // 4 + 4 * len(messages)
+    return prompt + (max_tokens or settings.LLM_EXPECTED_COMPLETION_TOKENS)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    retry_ms = response.headers.get("retry-after-ms")
+    if retry_ms:
+        try:
+            return max(float(retry_ms) / 1000, 0.0)
+        except ValueError:
+            pass
+    return parse_retry_after(response.headers.get("retry-after"))
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ):
+        self.requests = MinuteBudget(requests_per_minute or settings.LLM_REQUESTS_PER_MINUTE)
+        self.tokens = MinuteBudget(tokens_per_minute or settings.LLM_TOKENS_PER_MINUTE)
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.max_retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.paused_until = 0.0
+        self.active = 0
+        self._seq = itertools.count()
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._changed: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _delay(self, tokens: int) -> float:
+        pause = max(self.paused_until - time.monotonic(), 0.0)
+        return max(pause, self.requests.delay_for(1), self.tokens.delay_for(tokens))
+
+    def _notify(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._changed, self._dispatcher = loop, asyncio.Event(), None
+        self._changed.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        # Grants slots strictly in priority order: a waiting interactive call is
+        # never overtaken by background work, even if the background call is smaller.
+        while self._waiters:
+            priority, seq, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            delay = self._delay(tokens)
+            if delay <= 0 and self.active < self.max_concurrency:
+                heapq.heappop(self._waiters)
+                self.requests.take(1)
+                self.tokens.take(tokens)
+                self.active += 1
+                future.set_result(None)
+                continue
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=delay if delay > 0 else None)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _acquire(self, priority: Priority, tokens: int):
+        future = asyncio.get_running_loop().create_future()
+        if self._loop is not asyncio.get_running_loop():
+            self._waiters, self.active = [], 0
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), tokens, future))
+        self._notify()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(tokens, None)
+            raise
+
+    def _release(self, reserved: int, used: Optional[int]):
+        self.active -= 1
+        if used is not None:
+            self.tokens.adjust(used - reserved)
+        self._notify()
+
+    def _backoff(self, error: Exception, attempt: int):
+        retry_after = _retry_after(error)
+        if retry_after is None:
+            retry_after = random.uniform(0.5, 1.0) * min(2 ** attempt, 30)
+        self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        logger.warning(f"LLM request failed ({error.__class__.__name__}), retrying in {retry_after:.1f}s")
+
+    async def chat(self, client, priority: Priority = Priority.DEFAULT, **kwargs):
+        reserved = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(priority, reserved)
+            used = None
+            try:
+                response = await client.chat.completions.create(**kwargs)
+                usage = getattr(response, "usage", None)
+                used = getattr(usage, "total_tokens", None)
+                return response
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                self._backoff(e, attempt)
+            finally:
+                self._release(reserved, used)
+
+    async def chat_stream(self, client, priority: Priority = Priority.DEFAULT, **kwargs) -> AsyncIterator[str]:
+        # Yields content deltas. Retries only happen before the first delta is sent;
+        # once text has reached the caller a failure is raised instead of replayed.
+        reserved = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(priority, reserved)
+            used = None
+            started = False
+            stream = None
+            try:
+                stream = await client.chat.completions.create(
+                    stream=True, stream_options={"include_usage": True}, **kwargs
+                )
+                async for chunk in stream:
+                    usage = getattr(chunk, "usage", None)
+                    if usage is not None:
+                        used = getattr(usage, "total_tokens", None)
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        started = True
+                        yield delta
+                return
+            except Exception as e:
+                if started or attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                self._backoff(e, attempt)
+            finally:
+                if stream is not None:
+                    await stream.close()
+                self._release(reserved, used)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "queued": sum(1 for *_, future in self._waiters if not future.done()),
+            "requests_available": round(self.requests.available, 1),
+            "tokens_available": round(self.tokens.available),
+            "paused_for_seconds": round(max(self.paused_until - time.monotonic(), 0.0), 1),
+        }
+
+
+llm_scheduler = LLMScheduler()
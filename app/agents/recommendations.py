@@ -0,0 +1,197 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from loguru import logger
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.job import Job
+from app.models.profile import UserProfile
+from app.models.recommended_job import RecommendedJob
+from app.models.resume import Resume
+from app.agents.embedding_index import profile_text
+from app.agents.job_matcher import JobMatcherAgent, parse_match_score
+from app.agents.llm_scheduler import Priority
+from app.agents.score_cache import MatchScoreCache
+
+
+async def _feed_candidates(db: AsyncSession, profile: UserProfile, resume_text: str) -> List[Job]:
+    from app.scrapers.ingestion import load_corpus
+
+    query = profile_text(profile, resume_text)
+    for location in dict.fromkeys([profile.location, *settings.INGESTION_LOCATIONS]):
+        if location:
+            # The feed is a materialized view, so score whatever the corpus holds even
+            # when ingestion is disabled or behind.
+            candidates = await load_corpus(db, profile.domain, location, query=query, require_fresh=False)
+            if candidates:
+                return candidates
+    return []
+
+
+async def _trim_feed(db: AsyncSession, user_id: int):
+    result = await db.execute(
+        select(RecommendedJob.id)
+        .where(RecommendedJob.user_id == user_id)
+        .order_by(RecommendedJob.match_score.desc(), RecommendedJob.id.desc())
+        .offset(settings.RECOMMENDATION_FEED_MAX)
+    )
+    overflow = list(result.scalars().all())
+    if overflow:
+        await db.execute(delete(RecommendedJob).where(RecommendedJob.id.in_(overflow)))
+
+
+async def refresh_user_feed(user_id: int, job_ids: Optional[Iterable[int]] = None) -> Tuple[int, Set[int]]:
+    # Returns the number of jobs stored and the ids whose scoring failed, which are
+    # left out of the feed and retried later.
+    from app.scrapers.ingestion import job_to_scraped
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(UserProfile).options(selectinload(UserProfile.user)).where(UserProfile.user_id == user_id)
+        )
+        profile = result.scalar_one_or_none()
+        if not profile:
+            return 0, set()
+        result = await db.execute(
+            select(Resume).where(Resume.user_id == user_id, Resume.is_active == True, Resume.is_approved == True)
+        )
+        resume = result.scalars().first()
+        resume_text = resume.raw_text or "" if resume else ""
+        resume_data = resume.structured_data if resume else None
+
+        if job_ids is None:
+            candidates = await _feed_candidates(db, profile, resume_text)
+        else:
+            result = await db.execute(select(Job).where(Job.id.in_(list(job_ids)), Job.is_active == True))
+            candidates = list(result.scalars().all())
+        if not candidates:
+            if job_ids is None:
+                # Rows scored against the previous profile must not outlive it.
+                await db.execute(delete(RecommendedJob).where(RecommendedJob.user_id == user_id))
+                await db.commit()
+            return 0, set()
+
+        matcher = JobMatcherAgent()
+        scored = await matcher.batch_score_jobs(
+            [job_to_scraped(job) for job in candidates],
+            profile,
+            resume_text,
+            top_n=settings.RECOMMENDATION_FEED_MAX,
+            shortlist_k=settings.RECOMMENDATION_FEED_MAX,
+            cache=MatchScoreCache(db, user_id, matcher.model),
+            priority=Priority.BACKGROUND,
+            resume_data=resume_data,
+        )
+        job_by_url = {job.application_url: job for job in candidates}
+        scored_by_id, failed = {}, set()
+        for s in scored:
+            job = job_by_url.get(s["application_url"])
+            if job is None:
+                continue
+            if s.get("fallback"):
+                failed.add(job.id)
+            else:
+                scored_by_id[job.id] = s
+
+        if job_ids is None:
+            # A full refresh follows a profile or resume change, so older scores are stale.
+            await db.execute(delete(RecommendedJob).where(RecommendedJob.user_id == user_id))
+            existing = {}
+        else:
+            result = await db.execute(
+                select(RecommendedJob).where(
+                    RecommendedJob.user_id == user_id, RecommendedJob.job_id.in_(list(scored_by_id))
+                )
+            )
+            existing = {row.job_id: row for row in result.scalars().all()}
+
+        for job_id, data in scored_by_id.items():
+            row = existing.get(job_id)
+            if row is None:
+                row = RecommendedJob(user_id=user_id, job_id=job_id)
+                db.add(row)
+            row.match_score = parse_match_score(data.get("match_score"))
+            row.lexical_score = data.get("lexical_score")
+            row.match_reasons = data.get("match_reasons", [])
+            row.missing_skills = data.get("missing_skills", [])
+            row.apply_recommendation = data.get("apply_recommendation")
+            row.match_summary = data.get("match_summary", "")
+            row.keywords_matched = data.get("keywords_matched", [])
+        await db.flush()
+        await _trim_feed(db, user_id)
+        await db.commit()
+        return len(scored_by_id), failed
+
+
+class FeedRefresher:
+    # Pending work is coalesced per user: None means a full rebuild, a set means
+    # "score just these new jobs". A user is never refreshed by two workers at once.
+    def __init__(self):
+        self.pending: Dict[int, Optional[Set[int]]] = {}
+        self.running: Set[int] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._retries: List[asyncio.TimerHandle] = []
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        if self.pending:
+            self._wakeup.set()
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(settings.RECOMMENDATION_REFRESH_CONCURRENCY)
+        ]
+        logger.info(f"Recommendation feed refresher started with {len(self._workers)} workers.")
+
+    async def shutdown(self):
+        for handle in self._retries:
+            handle.cancel()
+        self._retries = []
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def schedule(self, user_id: int, job_ids: Optional[Iterable[int]] = None):
+        if job_ids is None or self.pending.get(user_id, set()) is None:
+            self.pending[user_id] = None
+        else:
+            self.pending.setdefault(user_id, set()).update(job_ids)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _retry_later(self, user_id: int, job_ids: Set[int]):
+        loop = asyncio.get_running_loop()
+        self._retries = [h for h in self._retries if h.when() > loop.time()]
+        self._retries.append(loop.call_later(settings.RECOMMENDATION_RETRY_SECONDS, self.schedule, user_id, job_ids))
+
+    def _next(self):
+        for user_id in self.pending:
+            if user_id not in self.running:
+                return user_id, self.pending.pop(user_id)
+        return None
+
+    async def _worker(self):
+        while True:
+            item = self._next()
+            if item is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            user_id, job_ids = item
+            self.running.add(user_id)
+            try:
+                count, failed = await refresh_user_feed(user_id, job_ids)
+                logger.debug(f"Refreshed feed for user {user_id}: {count} jobs scored, {len(failed)} failed")
+                if failed:
+                    self._retry_later(user_id, failed)
+            except Exception as e:
+                logger.error(f"Feed refresh failed for user {user_id}: {e}")
+            finally:
+                self.running.discard(user_id)
+                if user_id in self.pending:
+                    self._wakeup.set()
+
+
+feed_refresher = FeedRefresher()
@@ -1,26 +1,21 @@
-import pdfplumber
 import json
+from typing import AsyncIterator, Optional
 from openai import AsyncOpenAI
 from app.config import settings
+from app.agents.llm_scheduler import Priority, llm_scheduler
+from app.agents.resume_extraction import extract_resume_text
+from app.agents.resume_structure import resume_excerpt, structure_resume
 
 
 class ResumeAgent:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
         self.model = settings.OPENAI_MODEL
 
-    def _extract_text(self, file_path: str) -> str:
-        if file_path.endswith(".pdf"):
-            with pdfplumber.open(file_path) as pdf:
-                return "\n".join(page.extract_text() or "" for page in pdf.pages)
-        return ""
-
-    async def analyze(self, file_path: str, profile=None) -> dict:
-        raw_text = self._extract_text(file_path)
-
-        profile_context = ""
-        if profile:
-            profile_context = f"""
+    def profile_context(self, profile=None) -> str:
+        if not profile:
+            return ""
+        return f"""
 Student Profile:
 - Domain: {profile.domain}
 - Experience Level: {profile.experience_level}
@@ -28,6 +23,10 @@ Student Profile:
 - Target Roles: {", ".join(profile.target_roles or [])}
 """
 
+    async def analyze(self, file_path: str, profile=None, content_hash: Optional[str] = None) -> dict:
+        content_hash, raw_text = await extract_resume_text(file_path, content_hash)
+        profile_context = self.profile_context(profile)
+
         prompt = f"""You are an expert resume reviewer and career coach specializing in helping students land jobs.
 
 {profile_context}
@@ -62,7 +61,9 @@ Provide your analysis in the following JSON format ONLY (no other text):
     "ready_to_apply": <true|false>
 }}"""
 
-        response = await self.client.chat.completions.create(
+        response = await llm_scheduler.chat(
+            self.client,
+            Priority.INTERACTIVE,
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -71,16 +72,29 @@ Provide your analysis in the following JSON format ONLY (no other text):
 
         result = json.loads(response.choices[0].message.content)
         result["raw_text"] = raw_text
+        result["content_hash"] = content_hash
+        result["structured_data"] = structure_resume(raw_text, profile.skills or [] if profile else [])
         return result
 
-    async def generate_cover_letter(self, resume_text: str, job_description: str, user_name: str, company: str, role: str) -> str:
-        prompt = f"""You are an expert career coach. Write a compelling, personalized cover letter.
+    def _cover_letter_prompt(
+        self,
+        resume_text: str,
+        job_description: str,
+        user_name: str,
+        company: str,
+        role: str,
+        resume_data: Optional[dict] = None,
+    ) -> str:
+        resume_summary = resume_excerpt(
+            resume_data, resume_text, ("summary", "experience", "projects", "achievements"), 1600, focus=job_description
+        )
+        return f"""You are an expert career coach. Write a compelling, personalized cover letter.
 
 Candidate: {user_name}
 Applying for: {role} at {company}
 
 Resume Summary:
-{resume_text[:2000]}
+{resume_summary}
 
 Job Description:
 {job_description[:2000]}
@@ -93,9 +107,40 @@ Write a professional cover letter (3-4 paragraphs) that:
 
 Keep it concise (under 400 words). Do not use generic phrases like "I am writing to express my interest"."""
 
-        response = await self.client.chat.completions.create(
+    async def generate_cover_letter(
+        self,
+        resume_text: str,
+        job_description: str,
+        user_name: str,
+        company: str,
+        role: str,
+        resume_data: Optional[dict] = None,
+    ) -> str:
+        prompt = self._cover_letter_prompt(resume_text, job_description, user_name, company, role, resume_data)
+        response = await llm_scheduler.chat(
+            self.client,
+            Priority.INTERACTIVE,
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
         )
         return response.choices[0].message.content
+
+    async def stream_cover_letter(
+        self,
+        resume_text: str,
+        job_description: str,
+        user_name: str,
+        company: str,
+        role: str,
+        resume_data: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        prompt = self._cover_letter_prompt(resume_text, job_description, user_name, company, role, resume_data)
+        async for delta in llm_scheduler.chat_stream(
+            self.client,
+            Priority.INTERACTIVE,
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+        ):
+            yield delta
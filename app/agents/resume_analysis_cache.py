@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import dialect_insert
+from app.models.resume_analysis import ResumeAnalysis
+
+
+class ResumeAnalysisCache:
+    # Keyed by file content and the profile fields the review prompt uses, not by
+    # user or upload, so re-uploads and identical files share one analysis.
+    def __init__(self, db: AsyncSession, model: str):
+        self.db = db
+        self.model = model
+
+    async def _row(self, content_hash: str, profile_hash: str) -> Optional[ResumeAnalysis]:
+        result = await self.db.execute(
+            select(ResumeAnalysis).where(
+                ResumeAnalysis.content_hash == content_hash,
+                ResumeAnalysis.profile_hash == profile_hash,
+                ResumeAnalysis.model == self.model,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get(self, content_hash: str, profile_hash: str) -> Optional[dict]:
+        row = await self._row(content_hash, profile_hash)
+        return row.result if row else None
+
+    async def put(self, content_hash: str, profile_hash: str, result: dict):
+        stmt = dialect_insert(ResumeAnalysis).values(
+            content_hash=content_hash, profile_hash=profile_hash, model=self.model,
+            result=result, created_at=datetime.now(timezone.utc),
+        )
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["content_hash", "profile_hash", "model"],
+            set_={"result": stmt.excluded.result, "created_at": stmt.excluded.created_at},
+        ))
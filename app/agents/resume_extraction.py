@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import os
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from xml.etree import ElementTree
+import pdfplumber
+from loguru import logger
+from PyPDF2 import PdfReader
+from app.config import settings
+from app.scrapers.single_flight import SingleFlight
+
+HASH_CHUNK_SIZE = 1 << 20
+# Bump when extractor output changes so cached text from older versions is not reused.
+EXTRACTION_VERSION = 2
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_executor: Optional[Executor] = None
+_in_flight = SingleFlight(ttl_seconds=0)
+
+Extractor = Callable[[str], Awaitable[str]]
+EXTRACTORS: Dict[str, Extractor] = {}
+
+
+def register_extractor(*extensions: str):
+    def register(fn: Extractor) -> Extractor:
+        for extension in extensions:
+            EXTRACTORS[extension.lower()] = fn
+        return fn
+    return register
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pdf_page_count(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+def extract_pdf_pages(file_path: str, start: int, stop: int, max_chars: int) -> str:
+    # Runs in a worker process: only pages [start, stop) are parsed and each page's
+    # layout objects are released before the next one is read.
+    parts, size = [], 0
+    with pdfplumber.open(file_path, pages=list(range(start + 1, stop + 1))) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            page.close()
+            parts.append(text)
+            size += len(text) + 1
+            if size >= max_chars:
+                break
+    return "\n".join(parts)[:max_chars]
+
+
+def extract_docx_text(file_path: str, max_chars: int) -> str:
+    # word/document.xml is streamed out of the archive and parsed incrementally, so
+    # memory does not grow with the document (embedded images are never read).
+    parts, size = [], 0
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+        for _, element in ElementTree.iterparse(xml, events=("end",)):
+            tag = element.tag
+            if tag == f"{_W}t" and element.text:
+                parts.append(element.text)
+                size += len(element.text)
+            elif tag == f"{_W}tab":
+                parts.append("\t")
+            elif tag in (f"{_W}br", f"{_W}p"):
+                parts.append("\n")
+                size += 1
+            if tag == f"{_W}p":
+                element.clear()
+            if size >= max_chars:
+                break
+    return "".join(parts)[:max_chars]
+
+
+def get_extraction_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.RESUME_EXTRACT_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.RESUME_EXTRACT_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=settings.RESUME_EXTRACT_WORKERS, thread_name_prefix="resume-extract")
+    return _executor
+
+
+def shutdown_extraction_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+@register_extractor(".pdf")
+async def _extract_pdf(file_path: str) -> str:
+    loop = asyncio.get_running_loop()
+    pages = await asyncio.to_thread(pdf_page_count, file_path)
+    if pages > settings.RESUME_EXTRACT_MAX_PAGES:
+        logger.info(f"{os.path.basename(file_path)}: extracting first {settings.RESUME_EXTRACT_MAX_PAGES} of {pages} pages")
+    pages = min(pages, settings.RESUME_EXTRACT_MAX_PAGES)
+    step = max(settings.RESUME_EXTRACT_PAGES_PER_TASK, 1)
+    ranges = [(start, min(start + step, pages)) for start in range(0, pages, step)]
+    parts = await asyncio.gather(*[
+        loop.run_in_executor(
+            get_extraction_executor(), extract_pdf_pages, file_path, start, stop, settings.RESUME_EXTRACT_MAX_CHARS
+        )
+        for start, stop in ranges
+    ])
+    return "\n".join(parts)
+
+
+@register_extractor(".docx")
+async def _extract_docx(file_path: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_extraction_executor(), extract_docx_text, file_path, settings.RESUME_EXTRACT_MAX_CHARS
+    )
+
+
+async def extract_text(file_path: str) -> str:
+    extractor = EXTRACTORS.get(os.path.splitext(file_path)[1].lower())
+    if extractor is None:
+        logger.warning(f"No text extractor for {os.path.basename(file_path)}")
+        return ""
+    return (await extractor(file_path))[:settings.RESUME_EXTRACT_MAX_CHARS]
+
+
+class ExtractedTextCache:
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or settings.RESUME_TEXT_CACHE_DIR
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, content_hash: str) -> str:
+        limits = f"{settings.RESUME_EXTRACT_MAX_PAGES}p{settings.RESUME_EXTRACT_MAX_CHARS}c"
+        return os.path.join(self.cache_dir, f"{content_hash}.v{EXTRACTION_VERSION}.{limits}.txt")
+
+    def get(self, content_hash: str) -> Optional[str]:
+        try:
+            with open(self._path(content_hash), encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def put(self, content_hash: str, text: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(content_hash)
+        tmp = f"{path}.part"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+
+extracted_text_cache = ExtractedTextCache()
+
+
+async def _extract_uncached(file_path: str, content_hash: str) -> str:
+    text = await asyncio.to_thread(extracted_text_cache.get, content_hash)
+    if text is not None:
+        return text
+    text = await extract_text(file_path)
+    await asyncio.to_thread(extracted_text_cache.put, content_hash, text)
+    logger.debug(f"Extracted {len(text)} chars from {os.path.basename(file_path)}")
+    return text
+
+
+async def extract_resume_text(file_path: str, content_hash: Optional[str] = None) -> Tuple[str, str]:
+    if content_hash is None:
+        content_hash = await asyncio.to_thread(file_sha256, file_path)
+    # Identical files uploaded at the same time are parsed once.
+    text = await _in_flight.do(content_hash, lambda: _extract_uncached(file_path, content_hash))
+    return content_hash, text
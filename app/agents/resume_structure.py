@@ -0,0 +1,213 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+from app.agents.lexical_ranker import tokenize
+from app.scrapers.matcher import SkillAutomaton
+
+STRUCTURE_VERSION = 1
+
+SECTION_ALIASES = {
+    "summary": ("summary", "professional summary", "profile", "objective", "career objective", "about me"),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "internships", "internship experience", "relevant experience",
+    ),
+    "education": ("education", "academic background", "academics", "education and training"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects", "selected projects"),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "skills and tools", "technologies",
+        "tech stack", "core competencies", "tools and technologies",
+    ),
+    "certifications": ("certifications", "certificates", "licenses and certifications", "courses"),
+    "achievements": ("achievements", "awards", "honors", "awards and honors", "accomplishments"),
+}
+_HEADINGS = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+ENTRY_SECTIONS = ("experience", "projects", "education", "certifications", "achievements")
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE_RE = re.compile(r"\+?\(?\d[\d\s().-]{7,}\d")
+_LINKEDIN_RE = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?", re.I)
+_GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w-]+/?", re.I)
+_URL_RE = re.compile(r"(?:https?://|www\.)[^\s,;|]+", re.I)
+_BULLET_RE = re.compile(r"^\s*(?:[-*•·▪●◦‣–]|\d+[.)])\s+")
+_SKILL_SPLIT_RE = re.compile(r"[,;|•·▪●/\n]")
+
+
+def _heading(line: str) -> Optional[str]:
+    key = " ".join(re.sub(r"[^a-z ]", " ", line.lower().replace("&", " and ")).split())
+    if not key or len(line) > 40:
+        return None
+    return _HEADINGS.get(key)
+
+
+def _split_sections(lines: List[str]):
+    header, sections, current = [], {}, None
+    for line in lines:
+        name = _heading(line)
+        if name:
+            current = name
+            sections.setdefault(name, [])
+        elif current is None:
+            header.append(line)
+        else:
+            sections[current].append(line)
+    return header, sections
+
+
+def _entries(lines: List[str]) -> List[dict]:
+    entries: List[dict] = []
+    for line in lines:
+        bullet = _BULLET_RE.match(line)
+        text = line[bullet.end():].strip() if bullet else line
+        if bullet and entries:
+            entries[-1]["details"].append(text)
+        else:
+            entries.append({"title": text, "details": []})
+    return entries
+
+
+def _phrase(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+def _skills(section: List[str], text: str, known_skills: Iterable[str]) -> List[str]:
+    found: Dict[str, None] = {}
+    for line in section:
+        line = _BULLET_RE.sub("", line)
+        # "Languages: Python, Go" - the label is not a skill.
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for item in _SKILL_SPLIT_RE.split(line):
+            item = _phrase(item.strip(" .()"))
+            if item and len(item) <= 40 and len(item.split()) <= 4:
+                found[item] = None
+    for skill in sorted(SkillAutomaton(known_skills).find_all(text)):
+        found.setdefault(skill, None)
+    return list(found)
+
+
+def _name(header: List[str]) -> Optional[str]:
+    for line in header[:4]:
+        words = line.split()
+        if 2 <= len(words) <= 4 and all(w.replace(".", "").replace("-", "").replace("'", "").isalpha() for w in words):
+            return " ".join(w if not w.isupper() else w.title() for w in words)
+    return None
+
+
+def _contact(header: List[str], text: str) -> dict:
+    email = _EMAIL_RE.search(text)
+    phone = next((m.group().strip() for m in _PHONE_RE.finditer(text) if 10 <= sum(c.isdigit() for c in m.group()) <= 15), None)
+    linkedin = _LINKEDIN_RE.search(text)
+    github = _GITHUB_RE.search(text)
+    portfolio = next(
+        (url for url in _URL_RE.findall(" ".join(header)) if "linkedin.com" not in url.lower() and "github.com" not in url.lower()),
+        None,
+    )
+    return {
+        "name": _name(header),
+        "email": email.group() if email else None,
+        "phone": phone,
+        "linkedin_url": linkedin.group() if linkedin else None,
+        "github_url": github.group() if github else None,
+        "portfolio_url": portfolio,
+    }
+
+
+def structure_resume(text: str, known_skills: Iterable[str] = ()) -> dict:
+    lines = [line.strip() for line in (text or "").splitlines() if line.strip()]
+    header, sections = _split_sections(lines)
+    data = {
+        "version": STRUCTURE_VERSION,
+        "contact": _contact(header, text or ""),
+        "summary": " ".join(sections.get("summary", [])),
+        "skills": _skills(sections.get("skills", []), text or "", known_skills),
+    }
+    for name in ENTRY_SECTIONS:
+        data[name] = _entries(sections.get(name, []))
+    return data
+
+
+def _render_entry(entry: dict) -> str:
+    details = "; ".join(entry.get("details") or [])
+    return f"- {entry['title']}: {details}" if details else f"- {entry['title']}"
+
+
+def resume_excerpt(
+    data: Optional[dict], raw_text: str, sections: Sequence[str], limit: int, focus: str = ""
+) -> str:
+    # Compact, task-specific view of the resume. Without structured data (resumes
+    # analyzed before structuring existed) this degrades to the old prefix slice.
+    if not data:
+        return (raw_text or "")[:limit]
+    focus_terms = set(tokenize(focus))
+    skills = ["Skills: " + ", ".join(data["skills"][:40])] if data.get("skills") else []
+    parts: List[str] = []
+    for name in sections:
+        if name == "summary":
+            if data.get("summary"):
+                parts.append(f"Summary: {data['summary']}")
+            continue
+        entries = data.get(name) or []
+        if focus_terms:
+            entries = sorted(entries, key=lambda e: -len(focus_terms.intersection(tokenize(_render_entry(e)))))
+        if entries:
+            parts.append(f"{name.title()}:\n" + "\n".join(_render_entry(e) for e in entries))
+    if not parts:
+        # No recognisable sections (unusual layout): keep the skills line, then the text.
+        parts.append(raw_text or "")
+    return "\n".join(skills + parts)[:limit]
+
+
+def _label_words(label: str) -> str:
+    label = re.sub(r"([a-z])([A-Z])", r"\1 \2", label or "")
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", label.lower()).split())
+
+
+def _label_forms(bases: Iterable[str], suffixes: Iterable[str] = ("",)) -> frozenset:
+    # Whole-label spellings, compared with spaces removed ("Linked In" == "LinkedIn").
+    return frozenset(
+        f"{prefix}{base}{suffix}" for prefix in ("", "your") for base in bases for suffix in suffixes
+    )
+
+
+_LINK_SUFFIXES = ("", "url", "link", "profile", "profileurl", "profilelink")
+_CONTACT_LABELS = {
+    "email": _label_forms(("email", "emailaddress", "emailid", "contactemail", "primaryemail")),
+    "linkedin_url": _label_forms(("linkedin",), _LINK_SUFFIXES),
+    "github_url": _label_forms(("github",), _LINK_SUFFIXES),
+    "portfolio_url": _label_forms(("portfolio", "website", "personalwebsite", "portfoliowebsite"), _LINK_SUFFIXES),
+    "phone": _label_forms(
+        ("phone", "mobile", "telephone", "tel", "cell", "contactnumber", "mobilephone", "cellphone"), ("", "number", "no")
+    ),
+}
+_FIRST_NAME_LABELS = _label_forms(("firstname", "givenname", "fname"))
+_LAST_NAME_LABELS = _label_forms(("lastname", "familyname", "surname", "lname"))
+_FULL_NAME_LABELS = _label_forms(("name", "fullname", "legalname", "candidatename", "applicantname"))
+
+
+def known_field_value(field_label: str, field_type: str, profile: dict, data: Optional[dict]) -> Optional[str]:
+    # Identity and contact fields come straight from the account and the parsed
+    # resume; only fields that need judgement go to the model. Labels must name the
+    # field outright: "Emergency contact email" is someone else's and falls through.
+    if field_type not in ("text", "email", "tel", "url", "", None):
+        return None
+    contact = (data or {}).get("contact") or {}
+    words = _label_words(field_label).split()
+    while words and words[-1] in ("required", "optional"):
+        words.pop()
+    compact = "".join(words)
+    full_name = profile.get("full_name") or contact.get("name")
+
+    field = next((name for name, labels in _CONTACT_LABELS.items() if compact in labels), None)
+    if field == "phone":
+        value = contact.get("phone")
+    elif field:
+        value = profile.get(field) or contact.get(field)
+    elif compact in _FIRST_NAME_LABELS:
+        value = full_name.split()[0] if full_name else None
+    elif compact in _LAST_NAME_LABELS:
+        value = full_name.split()[-1] if full_name and len(full_name.split()) > 1 else None
+    elif compact in _FULL_NAME_LABELS:
+        value = full_name
+    else:
+        value = None
+    return value or None
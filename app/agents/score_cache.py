@@ -0,0 +1,57 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import dialect_insert
+from app.models.match_score import MatchScore
+
+
+def fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class MatchScoreCache:
+    def __init__(self, db: AsyncSession, user_id: int, model: str):
+        self.db = db
+        self.user_id = user_id
+        self.model = model
+
+    async def get_many(self, profile_hash: str, job_hashes: Iterable[str]) -> Dict[str, dict]:
+        job_hashes = list(set(job_hashes))
+        if not job_hashes:
+            return {}
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.MATCH_SCORE_CACHE_TTL_HOURS)
+        result = await self.db.execute(
+            select(MatchScore).where(
+                MatchScore.profile_hash == profile_hash,
+                MatchScore.job_hash.in_(job_hashes),
+                MatchScore.model == self.model,
+                MatchScore.created_at >= cutoff,
+            )
+        )
+        return {row.job_hash: row.result for row in result.scalars().all()}
+
+    async def put_many(self, profile_hash: str, results: Dict[str, dict]):
+        if not results:
+            return
+        now = datetime.now(timezone.utc)
+        # Upsert so two requests scoring the same jobs concurrently cannot trip the unique key.
+        stmt = dialect_insert(MatchScore).values([
+            {
+                "user_id": self.user_id, "profile_hash": profile_hash, "job_hash": job_hash,
+                "model": self.model, "result": result, "created_at": now,
+            }
+            for job_hash, result in results.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["profile_hash", "job_hash", "model"],
+            set_={"result": stmt.excluded.result, "created_at": stmt.excluded.created_at},
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+
+async def invalidate_user_scores(db: AsyncSession, user_id: int):
+    await db.execute(delete(MatchScore).where(MatchScore.user_id == user_id))
@@ -0,0 +1,40 @@
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.database import get_db
+from app.models.user import User
+from app.models.profile import UserProfile
+from app.utils.auth import get_current_user
+from app.utils.skill_analytics import skill_analytics
+
+router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
+
+
+@router.get("/skills-gap")
+async def skills_gap(
+    top: int = Query(10, ge=1, le=50, description="Number of missing skills to return"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await db.execute(select(UserProfile).where(UserProfile.user_id == current_user.id))
+    profile = result.scalar_one_or_none()
+    if not profile:
+        raise HTTPException(status_code=400, detail="Please complete your profile setup first.")
+
+    matrix = await skill_analytics.get_matrix()
+    start = time.perf_counter()
+    domain = getattr(profile.domain, "value", profile.domain)
+    gap = matrix.skills_gap(domain, profile.skills or [], top=top)
+    trends = matrix.domain_trends()
+    return {
+        **gap,
+        "domain_trends": trends,
+        "corpus": {
+            "jobs": matrix.job_count,
+            "skills": len(matrix.skills),
+            "built_at": matrix.built_at,
+            "trend_weeks": matrix.weeks,
+        },
+        "compute_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
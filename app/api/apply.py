@@ -1,9 +1,10 @@
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Optional, Dict, Set
+from app.config import settings
 from app.database import get_db, AsyncSessionLocal
 from app.models.user import User
 from app.models.profile import UserProfile
@@ -12,11 +13,15 @@ from app.models.job import Job, JobApplication, ApplicationStatus
 from app.utils.auth import get_current_user
 from app.utils.notifications import notification_manager
 from app.agents.apply_agent import AutoApplyAgent
+from app.agents.cover_letter_cache import CoverLetterCache, cover_letter_key
+from app.agents.resume_agent import ResumeAgent
 from loguru import logger
 from datetime import datetime, timezone
 
 router = APIRouter(prefix="/api/apply", tags=["Auto-Apply"])
 
+_cover_letters_in_progress: Set[int] = set()
+
 
 class AnswerRequest(BaseModel):
     answers: Dict[str, str]
@@ -85,6 +90,7 @@ async def _run_apply_agent(application_id: int, user_id: int):
             application_url=job.application_url,
             profile=profile_dict,
             resume_text=resume.raw_text or "",
+            resume_data=resume.structured_data,
             user_answers=user_answers,
             resume_file_path=resume.file_path,
             notify_callback=notify_callback,
@@ -183,6 +189,92 @@ async def answer_questions(
     }
 
 
+async def _load_cover_letter_context(db: AsyncSession, application_id: int, user_id: int):
+    result = await db.execute(
+        select(JobApplication, Job, Resume, User)
+        .join(Job, JobApplication.job_id == Job.id)
+        .join(Resume, JobApplication.resume_id == Resume.id)
+        .join(User, User.id == JobApplication.user_id)
+        .where(JobApplication.id == application_id, JobApplication.user_id == user_id)
+    )
+    return result.first()
+
+
+async def _stream_cover_letter(application_id: int, user_id: int):
+    try:
+        async with AsyncSessionLocal() as db:
+            row = await _load_cover_letter_context(db, application_id, user_id)
+            if not row:
+                return
+            application, job, resume, user = row
+
+            agent = ResumeAgent()
+            parts = []
+            try:
+                async for delta in agent.stream_cover_letter(
+                    resume.raw_text or "",
+                    job.description or "",
+                    user.full_name,
+                    job.company,
+                    job.title,
+                    resume.structured_data,
+                ):
+                    parts.append(delta)
+                    await notification_manager.notify_cover_letter_chunk(user_id, application_id, delta)
+            except Exception as e:
+                logger.error(f"Cover letter generation failed for application {application_id}: {e}")
+                await notification_manager.notify_cover_letter_chunk(user_id, application_id, "", done=True, error=str(e))
+                return
+
+            cover_letter = "".join(parts)
+            application.cover_letter = cover_letter
+            await CoverLetterCache(db, user_id, agent.model).put(*cover_letter_key(resume, job), cover_letter)
+            await db.commit()
+            await notification_manager.notify_cover_letter_chunk(user_id, application_id, "", done=True)
+    finally:
+        _cover_letters_in_progress.discard(application_id)
+
+
+@router.post("/cover-letter/{application_id}")
+async def generate_cover_letter(
+    application_id: int,
+    background_tasks: BackgroundTasks,
+    regenerate: bool = Query(False, description="Ignore a cached letter for this resume and job"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    row = await _load_cover_letter_context(db, application_id, current_user.id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Application not found.")
+    application, job, resume, _ = row
+
+    if application_id in _cover_letters_in_progress:
+        raise HTTPException(status_code=400, detail="A cover letter is already being generated for this application.")
+    # Claim the application before the next await so a concurrent request sees it;
+    # the streaming task releases it, every other exit releases it here.
+    _cover_letters_in_progress.add(application_id)
+    streaming = False
+    try:
+        if not regenerate:
+            cached = await CoverLetterCache(db, current_user.id, settings.OPENAI_MODEL).get(*cover_letter_key(resume, job))
+            if cached is not None:
+                application.cover_letter = cached
+                await db.commit()
+                return {"application_id": application_id, "status": "ready", "cached": True, "cover_letter": cached}
+
+        background_tasks.add_task(_stream_cover_letter, application_id, current_user.id)
+        streaming = True
+    finally:
+        if not streaming:
+            _cover_letters_in_progress.discard(application_id)
+    return {
+        "message": "Generating cover letter. Chunks arrive on WebSocket /api/apply/ws/{user_id} as 'cover_letter_chunk' messages.",
+        "application_id": application_id,
+        "status": "streaming",
+        "cached": False,
+    }
+
+
 @router.get("/status/{application_id}")
 async def get_application_status(
     application_id: int,
@@ -209,6 +301,7 @@ async def get_application_status(
         "status": application.status,
         "applied_at": application.applied_at,
         "pending_questions": application.pending_questions,
+        "cover_letter": application.cover_letter,
         "email_updates": application.email_updates,
         "created_at": application.created_at,
     }
@@ -1,74 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import selectinload
 from typing import Optional
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.models.user import User
 from app.models.profile import UserProfile
 from app.models.resume import Resume
 from app.models.job import Job, JobApplication, ApplicationStatus
+from app.models.recommended_job import RecommendedJob
 from app.utils.auth import get_current_user
-from app.scrapers.job_scraper import JobScraper
+from app.scrapers.circuit_breaker import get_circuit_breaker
+from app.scrapers.ingestion import load_corpus, job_to_scraped
+from app.scrapers.job_scraper import JobScraper, search_flight
+from app.scrapers.response_cache import response_cache
+from app.agents.embedding_index import profile_text
 from app.agents.job_matcher import JobMatcherAgent
+from app.agents.recommendations import feed_refresher
+from app.agents.score_cache import MatchScoreCache
 from loguru import logger
-from datetime import datetime, timezone
 
 router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
 
 
-@router.get("/discover")
-async def discover_jobs(
-    location: str = Query("United States", description="Preferred job location"),
-    max_results: int = Query(10, ge=1, le=25, description="Number of top job matches to return"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    profile_result = await db.execute(select(UserProfile).where(UserProfile.user_id == current_user.id))
+async def _discover_context(request: Request, db: AsyncSession, user: User, location: str):
+    profile_result = await db.execute(
+        select(UserProfile).options(selectinload(UserProfile.user)).where(UserProfile.user_id == user.id)
+    )
     profile = profile_result.scalar_one_or_none()
     if not profile:
         raise HTTPException(status_code=400, detail="Please complete your profile setup first.")
 
     resume_result = await db.execute(
-        select(Resume).where(Resume.user_id == current_user.id, Resume.is_active == True, Resume.is_approved == True)
+        select(Resume).where(Resume.user_id == user.id, Resume.is_active == True, Resume.is_approved == True)
     )
     approved_resume = resume_result.scalars().first()
     resume_text = approved_resume.raw_text or "" if approved_resume else ""
+    resume_data = approved_resume.structured_data if approved_resume else None
 
-    logger.info(f"Discovering jobs for user {current_user.id} | domain={profile.domain}")
+    logger.info(f"Discovering jobs for user {user.id} | domain={profile.domain}")
+
+    query = profile_text(profile, resume_text)
+    candidates = await load_corpus(db, profile.domain, location, query=query)
+    if not candidates:
+        logger.info(f"Corpus stale for {profile.domain} @ {location}; scraping fresh")
+        await request.app.state.ingestion.ingest(
+            profile.domain,
+            location,
+            skills=profile.skills,
+            experience_level=profile.experience_level,
+        )
+        # This scrape is narrowed to the user and leaves the shared watermarks alone,
+        # so read back what it stored without the freshness check.
+        candidates = await load_corpus(db, profile.domain, location, query=query, require_fresh=False)
+    return profile, resume_text, resume_data, candidates
 
-    scraper = JobScraper()
-    raw_jobs = await scraper.search_jobs(
-        domain=profile.domain,
-        skills=profile.skills,
-        location=location,
-        experience_level=profile.experience_level,
-        max_per_source=15,
-    )
 
-    if not raw_jobs:
+def _attach_job(job_data: dict, job_by_url: dict):
+    job = job_by_url.get(job_data["application_url"])
+    if job is None:
+        return
+    job_data["job_id"] = job.id
+    if not job.match_keywords:
+        job.match_keywords = job_data.get("keywords_matched", [])
+
+
+@router.get("/discover")
+async def discover_jobs(
+    request: Request,
+    location: str = Query("United States", description="Preferred job location"),
+    max_results: int = Query(10, ge=1, le=25, description="Number of top job matches to return"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    profile, resume_text, resume_data, candidates = await _discover_context(request, db, current_user, location)
+    if not candidates:
         return {"message": "No jobs found at this time. Try again later.", "jobs": [], "total": 0}
 
+    raw_jobs = [job_to_scraped(job) for job in candidates]
+
     matcher = JobMatcherAgent()
-    scored_jobs = await matcher.batch_score_jobs(raw_jobs, profile, resume_text, top_n=max_results)
+    score_cache = MatchScoreCache(db, current_user.id, matcher.model)
+    scored_jobs = await matcher.batch_score_jobs(
+        raw_jobs, profile, resume_text, top_n=max_results, cache=score_cache, resume_data=resume_data
+    )
 
+    job_by_url = {job.application_url: job for job in candidates}
     for job_data in scored_jobs:
-        existing = await db.execute(
-            select(Job).where(Job.application_url == job_data["application_url"])
-        )
-        if not existing.scalar_one_or_none():
-            job = Job(
-                title=job_data["title"],
-                company=job_data["company"],
-                location=job_data["location"],
-                job_type=job_data["job_type"],
-                description=job_data["description"],
-                requirements=job_data["requirements"],
-                application_url=job_data["application_url"],
-                source=job_data["source"],
-                posted_at=datetime.fromisoformat(job_data["posted_at"]) if job_data.get("posted_at") else None,
-                match_keywords=job_data.get("keywords_matched", []),
-            )
-            db.add(job)
+        _attach_job(job_data, job_by_url)
 
     await db.commit()
 
@@ -80,6 +101,124 @@ async def discover_jobs(
     }
 
 
+@router.get("/discover/stream")
+async def discover_jobs_stream(
+    request: Request,
+    location: str = Query("United States", description="Preferred job location"),
+    max_results: int = Query(10, ge=1, le=25, description="Number of top job matches to return"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    profile, resume_text, resume_data, candidates = await _discover_context(request, db, current_user, location)
+    raw_jobs = [job_to_scraped(job) for job in candidates]
+    candidate_ids = [job.id for job in candidates]
+    user_id = current_user.id
+
+    def line(payload: dict) -> bytes:
+        return (json.dumps(payload, default=str) + "\n").encode()
+
+    async def events():
+        yield line({"type": "candidates", "total": len(raw_jobs)})
+        if not raw_jobs:
+            yield line({"type": "summary", "total": 0, "jobs": [], "message": "No jobs found at this time. Try again later."})
+            return
+
+        # The request-scoped session is closed once the response starts, so scoring
+        # and the keyword write-back run on a session owned by the stream.
+        async with AsyncSessionLocal() as stream_db:
+            result = await stream_db.execute(select(Job).where(Job.id.in_(candidate_ids)))
+            job_by_url = {job.application_url: job for job in result.scalars().all()}
+
+            matcher = JobMatcherAgent()
+            score_cache = MatchScoreCache(stream_db, user_id, matcher.model)
+            scored_jobs = []
+            async for job_data in matcher.stream_score_jobs(
+                raw_jobs, profile, resume_text, cache=score_cache, resume_data=resume_data
+            ):
+                _attach_job(job_data, job_by_url)
+                scored_jobs.append(job_data)
+                yield line({"type": "job", "job": job_data})
+            await stream_db.commit()
+
+        scored_jobs.sort(key=lambda x: x["match_score"], reverse=True)
+        yield line({
+            "type": "summary",
+            "total": len(scored_jobs[:max_results]),
+            "jobs": scored_jobs[:max_results],
+            "profile_domain": profile.domain,
+            "experience_level": profile.experience_level,
+        })
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.get("/feed")
+async def recommendation_feed(
+    limit: int = Query(20, ge=1, le=50, description="Number of recommendations per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    query = (
+        select(RecommendedJob, Job)
+        .join(Job, RecommendedJob.job_id == Job.id)
+        .where(RecommendedJob.user_id == current_user.id, Job.is_active == True)
+    )
+    if cursor:
+        try:
+            score, last_id = (int(part) for part in cursor.split(":", 1))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        query = query.where(or_(
+            RecommendedJob.match_score < score,
+            and_(RecommendedJob.match_score == score, RecommendedJob.id < last_id),
+        ))
+    result = await db.execute(
+        query.order_by(RecommendedJob.match_score.desc(), RecommendedJob.id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+
+    if not rows and not cursor:
+        feed_refresher.schedule(current_user.id)
+        return {"jobs": [], "next_cursor": None, "status": "building"}
+
+    page = rows[:limit]
+    next_cursor = f"{page[-1][0].match_score}:{page[-1][0].id}" if len(rows) > limit else None
+    return {
+        "jobs": [
+            {
+                "job_id": job.id,
+                "title": job.title,
+                "company": job.company,
+                "location": job.location,
+                "job_type": job.job_type,
+                "source": job.source,
+                "application_url": job.application_url,
+                "posted_at": job.posted_at,
+                "match_score": rec.match_score,
+                "match_reasons": rec.match_reasons,
+                "missing_skills": rec.missing_skills,
+                "apply_recommendation": rec.apply_recommendation,
+                "match_summary": rec.match_summary,
+                "keywords_matched": rec.keywords_matched,
+                "updated_at": rec.updated_at,
+            }
+            for rec, job in page
+        ],
+        "next_cursor": next_cursor,
+        "status": "ready",
+    }
+
+
+@router.get("/sources/status")
+async def source_status(current_user: User = Depends(get_current_user)):
+    return {
+        "sources": [get_circuit_breaker(name).status() for name in JobScraper.SOURCES],
+        "feed_cache": response_cache.stats(),
+        "search_coalescing": search_flight.stats(),
+    }
+
+
 @router.get("/my-applications")
 async def my_applications(
     current_user: User = Depends(get_current_user),
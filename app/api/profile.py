@@ -7,6 +7,9 @@ from app.database import get_db
 from app.models.profile import UserProfile, JobDomain, ExperienceLevel
 from app.models.user import User
 from app.utils.auth import get_current_user
+from app.agents.score_cache import invalidate_user_scores
+from app.agents.recommendations import feed_refresher
+from app.utils.interest_index import interest_index
 
 router = APIRouter(prefix="/api/profile", tags=["Profile"])
 
@@ -74,6 +77,8 @@ async def setup_profile(
     db.add(profile)
     await db.commit()
     await db.refresh(profile)
+    interest_index.update_profile(profile)
+    feed_refresher.schedule(current_user.id)
     return {"message": "Profile created successfully", "profile_id": profile.id}
 
 
@@ -123,6 +128,9 @@ async def update_my_profile(
     for field, value in update_data.items():
         setattr(profile, field, value)
 
+    await invalidate_user_scores(db, current_user.id)
     await db.commit()
     await db.refresh(profile)
+    interest_index.update_profile(profile)
+    feed_refresher.schedule(current_user.id)
     return {"message": "Profile updated successfully"}
@@ -1,5 +1,4 @@
 import os
-import shutil
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -8,11 +7,17 @@ from app.models.user import User
 from app.models.resume import Resume
 from app.utils.auth import get_current_user
 from app.agents.resume_agent import ResumeAgent
+from app.agents.resume_analysis_cache import ResumeAnalysisCache
+from app.agents.resume_extraction import EXTRACTORS, extract_resume_text
+from app.agents.recommendations import feed_refresher
+from app.agents.score_cache import fingerprint, invalidate_user_scores
+from app.utils.resume_storage import UploadTooLargeError, resume_storage
 
 router = APIRouter(prefix="/api/resume", tags=["Resume"])
 
-UPLOAD_DIR = "uploads/resumes"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Resume files are limited to {round(limit / (1024 * 1024), 1):g} MB.")
 
 
 @router.post("/upload")
@@ -21,23 +26,39 @@ async def upload_resume(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    if not file.filename.endswith((".pdf", ".docx", ".doc")):
-        raise HTTPException(status_code=400, detail="Only PDF and Word documents are supported.")
-
-    user_dir = os.path.join(UPLOAD_DIR, str(current_user.id))
-    os.makedirs(user_dir, exist_ok=True)
-    file_path = os.path.join(user_dir, file.filename)
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension not in EXTRACTORS:
+        raise HTTPException(status_code=400, detail="Only PDF and Word (.docx) documents are supported.")
+    if file.size is not None and file.size > resume_storage.max_bytes:
+        raise _too_large(resume_storage.max_bytes)
 
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    try:
+        stored = await resume_storage.save(file, extension)
+    except UploadTooLargeError as e:
+        raise _too_large(e.limit)
 
-    file_size = os.path.getsize(file_path)
+    result = await db.execute(
+        select(Resume).where(
+            Resume.user_id == current_user.id,
+            Resume.content_hash == stored.content_hash,
+            Resume.is_active == True,
+        )
+    )
+    existing = result.scalars().first()
+    if existing:
+        return {
+            "message": "This resume was already uploaded.",
+            "resume_id": existing.id,
+            "filename": existing.filename,
+            "duplicate": True,
+        }
 
     resume = Resume(
         user_id=current_user.id,
         filename=file.filename,
-        file_path=file_path,
-        file_size=file_size,
+        file_path=stored.path,
+        file_size=stored.size,
+        content_hash=stored.content_hash,
         is_active=True,
     )
     db.add(resume)
@@ -48,6 +69,7 @@ async def upload_resume(
         "message": "Resume uploaded successfully. Use /api/resume/{id}/analyze to get AI feedback.",
         "resume_id": resume.id,
         "filename": resume.filename,
+        "duplicate": False,
     }
 
 
@@ -69,16 +91,29 @@ async def analyze_resume(
     profile = profile_result.scalar_one_or_none()
 
     agent = ResumeAgent()
-    analysis = await agent.analyze(resume.file_path, profile)
-
+    analysis_cache = ResumeAnalysisCache(db, agent.model)
+    profile_hash = fingerprint(agent.profile_context(profile))
+    content_hash, raw_text = await extract_resume_text(resume.file_path, resume.content_hash)
+    analysis = await analysis_cache.get(content_hash, profile_hash)
+    if analysis is None:
+        analysis = await agent.analyze(resume.file_path, profile, content_hash)
+        await analysis_cache.put(
+            content_hash, profile_hash, {k: v for k, v in analysis.items() if k not in ("raw_text", "content_hash")}
+        )
+    analysis = {**analysis, "raw_text": raw_text}
+
+    resume.content_hash = content_hash
     resume.raw_text = analysis.get("raw_text", "")
+    resume.structured_data = analysis.get("structured_data")
     resume.ai_score = analysis.get("score", 0)
     resume.ai_feedback = analysis.get("feedback", {})
     resume.improvement_suggestions = analysis.get("suggestions", [])
     resume.is_approved = analysis.get("score", 0) >= 70
 
+    await invalidate_user_scores(db, current_user.id)
     await db.commit()
     await db.refresh(resume)
+    feed_refresher.schedule(current_user.id)
 
     return {
         "resume_id": resume.id,
@@ -1,5 +1,6 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -12,6 +13,15 @@ class Settings(BaseSettings):
 
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o"
+    MATCHER_SHORTLIST_K: int = 15
+    MATCH_SCORE_CACHE_TTL_HOURS: int = 72
+    MATCHER_BATCH_SIZE: int = 8
+    MATCHER_BATCH_TOKEN_BUDGET: int = 6000
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 30000
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_MAX_RETRIES: int = 3
+    LLM_EXPECTED_COMPLETION_TOKENS: int = 500
 
     GMAIL_CLIENT_ID: Optional[str] = None
     GMAIL_CLIENT_SECRET: Optional[str] = None
@@ -26,6 +36,57 @@ class Settings(BaseSettings):
     TWILIO_AUTH_TOKEN: Optional[str] = None
     TWILIO_PHONE_NUMBER: Optional[str] = None
 
+    SCRAPER_HTTP2: bool = True
+    SCRAPER_TIMEOUT: float = 30.0
+    SCRAPER_CONNECT_TIMEOUT: float = 10.0
+    SCRAPER_MAX_CONNECTIONS: int = 100
+    SCRAPER_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    SCRAPER_KEEPALIVE_EXPIRY: float = 30.0
+    SCRAPER_MAX_CONNECTIONS_PER_HOST: int = 10
+    SCRAPER_MAX_CONCURRENT_REQUESTS: int = 8
+    SCRAPER_RATE_PER_SECOND: float = 2.0
+    SCRAPER_RATE_BURST: float = 4.0
+    SCRAPER_HOST_RATES: Dict[str, float] = {"www.indeed.com": 0.5}
+    INDEED_MAX_PAGES: int = 3
+    # At most BAND_COUNT - 1 (3): the four simhash bands only guarantee candidates up to that distance.
+    DEDUP_HAMMING_THRESHOLD: int = Field(3, ge=0, le=3)
+    SCRAPER_BREAKER_FAILURE_THRESHOLD: int = 3
+    SCRAPER_BREAKER_BASE_BACKOFF_SECONDS: float = 30.0
+    SCRAPER_BREAKER_MAX_BACKOFF_SECONDS: float = 900.0
+    SCRAPER_CACHE_DIR: str = ".cache/http"
+    SCRAPER_CACHE_TTL_SECONDS: int = 300
+    SCRAPER_SINGLE_FLIGHT_TTL_SECONDS: int = 60
+    REMOTEOK_STREAM_FEED: bool = True
+    SCRAPER_PARSE_EXECUTOR: str = "process"
+    SCRAPER_PARSE_WORKERS: int = 2
+
+    INGESTION_ENABLED: bool = True
+    INGESTION_INTERVAL_MINUTES: int = 30
+    INGESTION_LOCATIONS: List[str] = ["United States"]
+    INGESTION_MAX_PER_SOURCE: int = 30
+    INGESTION_CONCURRENCY: int = 3
+    INGESTION_OVERLAP_MINUTES: int = 60
+    JOB_RETENTION_DAYS: int = 30
+    DISCOVER_CORPUS_MAX_AGE_MINUTES: int = 120
+    DISCOVER_CANDIDATE_LIMIT: int = 200
+    EMBEDDING_INDEX_DIR: str = ".cache/embeddings"
+    EMBEDDING_DIM: int = 512
+    INTEREST_MIN_OVERLAP: int = 2
+    RECOMMENDATION_FEED_MAX: int = 50
+    RECOMMENDATION_REFRESH_CONCURRENCY: int = 2
+    RECOMMENDATION_RETRY_SECONDS: int = 300
+    SKILL_ANALYTICS_TTL_SECONDS: int = 600
+    SKILL_ANALYTICS_TREND_WEEKS: int = 8
+
+    RESUME_EXTRACT_EXECUTOR: str = "process"
+    RESUME_EXTRACT_WORKERS: int = 4
+    RESUME_EXTRACT_PAGES_PER_TASK: int = 4
+    RESUME_EXTRACT_MAX_PAGES: int = 25
+    RESUME_EXTRACT_MAX_CHARS: int = 60000
+    RESUME_TEXT_CACHE_DIR: str = ".cache/resume_text"
+    RESUME_STORAGE_DIR: str = "uploads/resumes"
+    RESUME_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -1,3 +1,4 @@
+import os
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.config import settings
@@ -10,6 +11,15 @@ class Base(DeclarativeBase):
     pass
 
 
+def dialect_insert(table):
+    # INSERT ... ON CONFLICT for the configured backend (SQLite locally, PostgreSQL in production).
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
@@ -18,6 +28,21 @@ async def get_db():
             await session.close()
 
 
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def _upgrade_schema(connection):
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
 async def init_db():
+    # create_all adds missing tables but never columns; the migrations bring
+    # databases created by older versions up to date.
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
@@ -4,7 +4,14 @@ from contextlib import asynccontextmanager
 from loguru import logger
 from app.config import settings
 from app.database import init_db
-from app.api import auth, profile, resume, jobs, apply, email
+from app.agents.embedding_index import embedding_index
+from app.agents.recommendations import feed_refresher
+from app.scrapers.http_client import scraper_http_client
+from app.scrapers.indeed_parser import shutdown_parser_executor
+from app.agents.resume_extraction import shutdown_extraction_executor
+from app.scrapers.ingestion import JobIngestionService
+from app.utils.interest_index import interest_index
+from app.api import auth, profile, resume, jobs, apply, email, analytics
 
 
 @asynccontextmanager
@@ -12,8 +19,21 @@ async def lifespan(app: FastAPI):
     logger.info("Starting AI Job Applier API...")
     await init_db()
     logger.info("Database initialized.")
+    embedding_index.load()
+    await interest_index.rebuild()
+    await scraper_http_client.start()
+    app.state.http_client = scraper_http_client
+    app.state.ingestion = JobIngestionService(scraper_http_client)
+    if settings.INGESTION_ENABLED:
+        app.state.ingestion.start()
+    feed_refresher.start()
     yield
     logger.info("Shutting down...")
+    await feed_refresher.shutdown()
+    app.state.ingestion.shutdown()
+    await scraper_http_client.close()
+    shutdown_parser_executor()
+    shutdown_extraction_executor()
 
 
 app = FastAPI(
@@ -37,6 +57,7 @@ app.include_router(resume.router)
 app.include_router(jobs.router)
 app.include_router(apply.router)
 app.include_router(email.router)
+app.include_router(analytics.router)
 
 
 @app.get("/")
@@ -2,3 +2,9 @@ from app.models.user import User
 from app.models.profile import UserProfile
 from app.models.resume import Resume
 from app.models.job import Job, JobApplication
+from app.models.job_scope import JobScope
+from app.models.scrape_watermark import ScrapeWatermark
+from app.models.match_score import MatchScore
+from app.models.recommended_job import RecommendedJob
+from app.models.resume_analysis import ResumeAnalysis
+from app.models.cover_letter import CoverLetter
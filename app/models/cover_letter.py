@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, UniqueConstraint
+from datetime import datetime, timezone
+from app.database import Base
+
+
+class CoverLetter(Base):
+    __tablename__ = "cover_letters"
+    __table_args__ = (UniqueConstraint("user_id", "resume_hash", "job_hash", "model", name="uq_cover_letter_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    resume_hash = Column(String(64), nullable=False)
+    job_hash = Column(String(64), nullable=False)
+    model = Column(String(100), nullable=False)
+    text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -28,12 +28,19 @@ class Job(Base):
     experience_required = Column(String(100), nullable=True)
     description = Column(Text, nullable=True)
     requirements = Column(JSON, default=list)
-    application_url = Column(String(1000), nullable=False)
+    application_url = Column(String(1000), nullable=False, index=True)
     source = Column(String(100), nullable=True)
+    domain = Column(String(100), nullable=True, index=True)
+    search_location = Column(String(255), nullable=True, index=True)
     posted_at = Column(DateTime, nullable=True)
     scraped_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     is_active = Column(Boolean, default=True)
     match_keywords = Column(JSON, default=list)
+    simhash = Column(String(16), nullable=True)
+    simhash_band_0 = Column(Integer, nullable=True, index=True)
+    simhash_band_1 = Column(Integer, nullable=True, index=True)
+    simhash_band_2 = Column(Integer, nullable=True, index=True)
+    simhash_band_3 = Column(Integer, nullable=True, index=True)
 
     applications = relationship("JobApplication", back_populates="job")
 
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, Index
+from datetime import datetime, timezone
+from app.database import Base
+
+
+class JobScope(Base):
+    # A posting belongs to every (domain, location) search that returned it, so the
+    # same job can sit in several domains' corpora at once.
+    __tablename__ = "job_scopes"
+    __table_args__ = (
+        UniqueConstraint("job_id", "domain", "location", name="uq_job_scope"),
+        Index("ix_job_scopes_lookup", "domain", "location", "scraped_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)
+    domain = Column(String(100), nullable=False)
+    location = Column(String(255), nullable=False)
+    scraped_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
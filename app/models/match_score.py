@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, UniqueConstraint
+from datetime import datetime, timezone
+from app.database import Base
+
+
+class MatchScore(Base):
+    __tablename__ = "match_scores"
+    __table_args__ = (UniqueConstraint("profile_hash", "job_hash", "model", name="uq_match_score_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    profile_hash = Column(String(64), nullable=False)
+    job_hash = Column(String(64), nullable=False)
+    model = Column(String(100), nullable=False)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, JSON, ForeignKey, Index, UniqueConstraint
+from datetime import datetime, timezone
+from app.database import Base
+
+
+class RecommendedJob(Base):
+    __tablename__ = "recommended_jobs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", name="uq_recommended_job"),
+        Index("ix_recommended_jobs_feed", "user_id", "match_score", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    match_score = Column(Integer, nullable=False)
+    lexical_score = Column(Float, nullable=True)
+    match_reasons = Column(JSON, default=list)
+    missing_skills = Column(JSON, default=list)
+    apply_recommendation = Column(String(50), nullable=True)
+    match_summary = Column(Text, nullable=True)
+    keywords_matched = Column(JSON, default=list)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
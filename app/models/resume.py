@@ -13,8 +13,10 @@ class Resume(Base):
     filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)
 
     raw_text = Column(Text, nullable=True)
+    structured_data = Column(JSON, nullable=True)
     ai_score = Column(Integer, nullable=True)
     ai_feedback = Column(JSON, nullable=True)
     improvement_suggestions = Column(JSON, nullable=True)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from datetime import datetime, timezone
+from app.database import Base
+
+
+class ResumeAnalysis(Base):
+    __tablename__ = "resume_analyses"
+    __table_args__ = (UniqueConstraint("content_hash", "profile_hash", "model", name="uq_resume_analysis_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False)
+    profile_hash = Column(String(64), nullable=False)
+    model = Column(String(100), nullable=False)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from datetime import datetime, timezone
+from app.database import Base
+
+
+class ScrapeWatermark(Base):
+    __tablename__ = "scrape_watermarks"
+    __table_args__ = (UniqueConstraint("source", "scope", name="uq_scrape_watermark_source_scope"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(100), nullable=False)
+    scope = Column(String(500), nullable=False, index=True)
+    high_water_mark = Column(DateTime, nullable=True)
+    last_run_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,132 @@
+import enum
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import httpx
+from app.config import settings
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class SourceUnavailableError(Exception):
+    def __init__(self, source: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        self.source = source
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(f"{source} unavailable (status={status_code})")
+
+
+class CircuitOpenError(Exception):
+    # Raised instead of calling a source whose breaker is not admitting requests.
+    def __init__(self, source: str, state: CircuitState):
+        self.source = source
+        self.state = state
+        super().__init__(f"{source} circuit {state.value}")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def retry_after_from(error: Exception) -> Optional[float]:
+    if isinstance(error, SourceUnavailableError):
+        return error.retry_after
+    if isinstance(error, httpx.HTTPStatusError):
+        return parse_retry_after(error.response.headers.get("Retry-After"))
+    return None
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        base_backoff: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.SCRAPER_BREAKER_FAILURE_THRESHOLD
+        self.base_backoff = base_backoff or settings.SCRAPER_BREAKER_BASE_BACKOFF_SECONDS
+        self.max_backoff = max_backoff or settings.SCRAPER_BREAKER_MAX_BACKOFF_SECONDS
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() < self.open_until:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def release_probe(self):
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._probe_in_flight = False
+
+    def record_failure(self, error: Optional[Exception] = None):
+        self.failures += 1
+        self.last_error = str(error) if error else None
+        self._probe_in_flight = False
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._trip(retry_after_from(error) if error else None)
+
+    def _trip(self, retry_after: Optional[float]):
+        self.trips += 1
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.trips - 1))
+        delay = random.uniform(backoff / 2, backoff)
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        self.state = CircuitState.OPEN
+        self.open_until = time.monotonic() + delay
+
+    def status(self) -> dict:
+        retry_in = max(self.open_until - time.monotonic(), 0.0) if self.state == CircuitState.OPEN else 0.0
+        return {
+            "source": self.name,
+            "state": self.state.value,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "retry_in_seconds": round(retry_in, 1),
+            "last_error": self.last_error,
+        }
+
+
+circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    if name not in circuit_breakers:
+        circuit_breakers[name] = CircuitBreaker(name)
+    return circuit_breakers[name]
@@ -0,0 +1,120 @@
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.scrapers.scraped_job import ScrapedJob
+
+SIGNATURE_BITS = 64
+BAND_COUNT = 4
+BAND_BITS = SIGNATURE_BITS // BAND_COUNT
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh", "plc", "pvt", "sa"}
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def normalize_company(company: str) -> str:
+    tokens = _tokens(company)
+    while tokens and tokens[-1] in _COMPANY_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+
+
+def _features(title: str, company: str, description: str, location: str = "") -> Dict[str, float]:
+    # Title, company and location identify a posting across boards; descriptions differ
+    # a lot between sources (full text vs. snippet), so they carry a seventh of the weight.
+    # Location is split into tokens so "New York, NY" and "New York, NY, USA" stay close
+    # while the same role in another city does not collapse into one posting.
+    features: Dict[str, float] = defaultdict(float)
+    title_tokens = _tokens(title)
+    for token in title_tokens:
+        features[f"t:{token}"] += 3.0
+    for a, b in zip(title_tokens, title_tokens[1:]):
+        features[f"t:{a} {b}"] += 3.0
+    company_key = normalize_company(company)
+    if company_key:
+        features[f"c:{company_key}"] += 3.0 * max(len(title_tokens), 1)
+    location_tokens = _tokens(location)
+    for token in location_tokens:
+        features[f"l:{token}"] += 3.0 * max(len(title_tokens), 1) / len(location_tokens)
+
+    desc_tokens = _tokens(description)
+    shingles = [" ".join(desc_tokens[i:i + 3]) for i in range(max(len(desc_tokens) - 2, 0))]
+    if shingles:
+        identity_weight = sum(features.values())
+        per_shingle = identity_weight / 6 / len(shingles)
+        for shingle in shingles:
+            features[f"d:{shingle}"] += per_shingle
+    return features
+
+
+def simhash(title: str, company: str, description: str = "", location: str = "") -> int:
+    weights = [0.0] * SIGNATURE_BITS
+    for feature, weight in _features(title, company, description, location).items():
+        h = _hash64(feature)
+        for bit in range(SIGNATURE_BITS):
+            weights[bit] += weight if h >> bit & 1 else -weight
+    signature = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature
+
+
+def job_signature(job: ScrapedJob) -> int:
+    return simhash(job.title, job.company, job.description, job.location)
+
+
+def signature_bands(signature: int) -> Tuple[int, ...]:
+    mask = (1 << BAND_BITS) - 1
+    return tuple((signature >> (band * BAND_BITS)) & mask for band in range(BAND_COUNT))
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def to_hex(signature: int) -> str:
+    return f"{signature:016x}"
+
+
+class NearDuplicateIndex:
+    # With BAND_COUNT bands, any two signatures within BAND_COUNT - 1 bits share
+    # at least one identical band, so band lookups find every candidate. A larger
+    # threshold would silently miss pairs, so it is rejected.
+    def __init__(self, threshold: Optional[int] = None):
+        self.threshold = settings.DEDUP_HAMMING_THRESHOLD if threshold is None else threshold
+        if not 0 <= self.threshold < BAND_COUNT:
+            raise ValueError(f"Hamming threshold must be between 0 and {BAND_COUNT - 1}, got {self.threshold}")
+        self._bands: List[Dict[int, List[Tuple[int, object]]]] = [defaultdict(list) for _ in range(BAND_COUNT)]
+
+    def add(self, signature: int, key):
+        for band, value in enumerate(signature_bands(signature)):
+            self._bands[band][value].append((signature, key))
+
+    def find(self, signature: int):
+        for band, value in enumerate(signature_bands(signature)):
+            for other, key in self._bands[band].get(value, ()):
+                if hamming(signature, other) <= self.threshold:
+                    return key
+        return None
+
+
+def dedupe_jobs(jobs: Iterable[ScrapedJob]) -> List[ScrapedJob]:
+    index = NearDuplicateIndex()
+    unique = []
+    for job in jobs:
+        signature = job_signature(job)
+        if index.find(signature) is not None:
+            continue
+        index.add(signature, job.application_url)
+        unique.append(job)
+    return unique
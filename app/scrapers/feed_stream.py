@@ -0,0 +1,87 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\r\n"
+
+
+def read_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    started = False
+    # After an item only ',' or ']' may follow; after '[' or ',' only an item may,
+    # except that ']' may close an empty array.
+    expect_separator = False
+    empty = True
+    eof = False
+    chunk_iter = iter(chunks)
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+
+        if pos < len(buf):
+            char = buf[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError("Feed is not a JSON array")
+                started = True
+                pos += 1
+                continue
+            if expect_separator:
+                if char == "]":
+                    return
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' at offset {pos}")
+                expect_separator = False
+                pos += 1
+                continue
+            if char == "]" and empty:
+                return
+            if char in ",]":
+                raise ValueError(f"Expected a value at offset {pos}")
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+                end = None
+            if end is not None:
+                # A scalar can decode cleanly from a truncated buffer ("2" out of
+                # "2.5"), so an item only counts once the separator after it is here.
+                after = end
+                while after < len(buf) and buf[after] in _WHITESPACE:
+                    after += 1
+                if (after < len(buf) and buf[after] in ",]") or (after == len(buf) and eof):
+                    yield item
+                    pos = end
+                    expect_separator = True
+                    empty = False
+                    continue
+                if eof:
+                    raise ValueError(f"Expected ',' or ']' at offset {after}")
+
+        if eof:
+            if started:
+                raise ValueError("Feed ended before the closing bracket")
+            return
+
+        buf = buf[pos:]
+        pos = 0
+        try:
+            buf += utf8.decode(next(chunk_iter))
+        except StopIteration:
+            buf += utf8.decode(b"", final=True)
+            eof = True
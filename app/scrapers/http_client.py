@@ -0,0 +1,82 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from loguru import logger
+from app.config import settings
+from app.scrapers.rate_limiter import HostRateLimiter, rate_limiter as default_rate_limiter
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ScraperHTTPClient:
+    def __init__(self, rate_limiter: Optional[HostRateLimiter] = None):
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def is_started(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = settings.SCRAPER_HTTP2
+        if http2 and not _http2_available():
+            logger.warning("SCRAPER_HTTP2 is enabled but the 'h2' package is missing; falling back to HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.SCRAPER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SCRAPER_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.SCRAPER_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(
+            settings.SCRAPER_TIMEOUT,
+            connect=settings.SCRAPER_CONNECT_TIMEOUT,
+        )
+        return httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout, follow_redirects=True)
+
+    async def start(self):
+        if self.is_started:
+            return
+        self._client = self._build_client()
+        logger.info("Scraper HTTP client pool started.")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Scraper HTTP client pool closed.")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Scripts and one-off jobs may run without the app lifespan; start lazily for them.
+        if not self.is_started:
+            self._client = self._build_client()
+        return self._client
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(settings.SCRAPER_MAX_CONNECTIONS_PER_HOST)
+        return self._host_slots[host]
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        async with self.rate_limiter.limit(url), self._host_slot(url):
+            return await self.client.get(url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        async with self.rate_limiter.limit(url), self._host_slot(url):
+            async with self.client.stream(method, url, **kwargs) as response:
+                yield response
+
+
+scraper_http_client = ScraperHTTPClient()
@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+from loguru import logger
+from lxml import etree, html as lxml_html
+from app.config import settings
+from app.scrapers.scraped_job import ScrapedJob
+
+INDEED_HOST = "https://www.indeed.com"
+
+_CARDS = etree.XPath("//div[contains(@class, 'job_seen_beacon')]")
+_TITLE = etree.XPath(".//h2[contains(@class, 'jobTitle')][1]")
+_COMPANY = etree.XPath(".//span[@data-testid='company-name'][1]")
+_LOCATION = etree.XPath(".//div[@data-testid='text-location'][1]")
+_LINK = etree.XPath(".//a[contains(@class, 'jcs-JobTitle')][1]/@href")
+_SNIPPET = etree.XPath(".//div[contains(@class, 'job-snippet')][1]")
+
+_executor: Optional[Executor] = None
+
+
+def _text(nodes, default: str = "") -> str:
+    if not nodes:
+        return default
+    return "".join(part.strip() for part in nodes[0].itertext())
+
+
+def parse_indeed_html(page: str, max_results: int = 50) -> List[ScrapedJob]:
+    if not page:
+        return []
+    root = lxml_html.fromstring(page)
+    jobs = []
+    for card in _CARDS(root)[:max_results]:
+        try:
+            href = _LINK(card)
+            jobs.append(ScrapedJob(
+                title=_text(_TITLE(card), "N/A"),
+                company=_text(_COMPANY(card), "N/A"),
+                location=_text(_LOCATION(card), "Remote"),
+                job_type="full-time",
+                description=_text(_SNIPPET(card)),
+                application_url=f"{INDEED_HOST}{href[0]}" if href else "",
+                source="indeed",
+            ))
+        except Exception as e:
+            logger.debug(f"Error parsing Indeed job card: {e}")
+            continue
+    return jobs
+
+
+def get_parser_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.SCRAPER_PARSE_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.SCRAPER_PARSE_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=settings.SCRAPER_PARSE_WORKERS, thread_name_prefix="indeed-parse")
+    return _executor
+
+
+def shutdown_parser_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def parse_indeed_results(page: str, max_results: int = 50) -> List[ScrapedJob]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parser_executor(), parse_indeed_html, page, max_results)
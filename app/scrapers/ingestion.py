@@ -0,0 +1,325 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from loguru import logger
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.agents.embedding_index import embedding_index
+from app.agents.recommendations import feed_refresher
+from app.config import settings
+from app.database import AsyncSessionLocal, dialect_insert
+from app.models.job import Job
+from app.models.job_scope import JobScope
+from app.models.profile import JobDomain
+from app.models.scrape_watermark import ScrapeWatermark
+from app.scrapers.dedup import (
+    BAND_COUNT, NearDuplicateIndex, dedupe_jobs, job_signature, signature_bands, to_hex,
+)
+from app.scrapers.http_client import ScraperHTTPClient
+from app.scrapers.job_scraper import JobScraper, ScrapedJob, SearchResult
+from app.scrapers.response_cache import response_cache
+from app.utils.interest_index import interest_index
+from app.utils.notifications import notification_manager
+
+
+def _key(value) -> str:
+    return getattr(value, "value", value)
+
+
+def _scope(domain: str, location: str) -> str:
+    return f"{_key(domain)}|{location}"
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def job_to_scraped(job: Job) -> ScrapedJob:
+    return ScrapedJob(
+        title=job.title,
+        company=job.company,
+        location=job.location or "",
+        job_type=job.job_type or "",
+        description=job.description or "",
+        application_url=job.application_url,
+        source=job.source or "",
+        posted_at=job.posted_at,
+        experience_required=job.experience_required,
+        requirements=list(job.requirements or []),
+    )
+
+
+async def _find_near_duplicates(db: AsyncSession, signatures: Dict[str, int]) -> Dict[str, Job]:
+    if not signatures:
+        return {}
+    band_values = [set() for _ in range(BAND_COUNT)]
+    for signature in signatures.values():
+        for band, value in enumerate(signature_bands(signature)):
+            band_values[band].add(value)
+    band_columns = [Job.simhash_band_0, Job.simhash_band_1, Job.simhash_band_2, Job.simhash_band_3]
+    result = await db.execute(
+        select(Job).where(or_(*[column.in_(values) for column, values in zip(band_columns, band_values)]))
+    )
+    index = NearDuplicateIndex()
+    for row in result.scalars().all():
+        if row.simhash:
+            index.add(int(row.simhash, 16), row)
+    matches = {}
+    for url, signature in signatures.items():
+        row = index.find(signature)
+        if row is not None:
+            matches[url] = row
+    return matches
+
+
+async def upsert_scraped_jobs(db: AsyncSession, scraped: List[ScrapedJob], domain: str, location: str) -> List[Job]:
+    by_url = {}
+    for job in dedupe_jobs(scraped):
+        if job.application_url and job.application_url not in by_url:
+            by_url[job.application_url] = job
+    if not by_url:
+        return []
+
+    signatures = {url: job_signature(job) for url, job in by_url.items()}
+    result = await db.execute(select(Job).where(Job.application_url.in_(list(by_url))))
+    existing = {job.application_url: job for job in result.scalars().all()}
+    unseen = {url: sig for url, sig in signatures.items() if url not in existing}
+    existing.update(await _find_near_duplicates(db, unseen))
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    seen_rows = set()
+    written = []
+    created = []
+    for url, job in by_url.items():
+        row = existing.get(url)
+        if row is None:
+            # domain / search_location record where a posting was first found; scope
+            # membership lives in job_scopes so later scrapes add to it instead.
+            row = Job(application_url=url, domain=_key(domain), search_location=location)
+            db.add(row)
+            created.append((row, job))
+        elif id(row) in seen_rows:
+            continue
+        seen_rows.add(id(row))
+        row.scraped_at = now
+        row.is_active = True
+        rows.append(row)
+        if row.application_url != url:
+            # Same posting seen on another board: keep the stored copy, just mark it fresh.
+            continue
+
+        signature = signatures[url]
+        written.append((row, job))
+        row.title = job.title
+        row.company = job.company
+        row.location = job.location
+        row.job_type = job.job_type
+        row.experience_required = job.experience_required
+        row.description = job.description
+        row.requirements = job.requirements
+        row.source = job.source
+        row.posted_at = job.posted_at
+        row.simhash = to_hex(signature)
+        (row.simhash_band_0, row.simhash_band_1,
+         row.simhash_band_2, row.simhash_band_3) = signature_bands(signature)
+
+    await db.flush()
+    scope_rows = [{"job_id": row.id, "domain": _key(domain), "location": location, "scraped_at": now} for row in rows]
+    stmt = dialect_insert(JobScope).values(scope_rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["job_id", "domain", "location"], set_={"scraped_at": stmt.excluded.scraped_at}
+        )
+    )
+    await db.commit()
+    await asyncio.to_thread(
+        embedding_index.upsert, [(row.id, job) for row, job in written], [row.simhash for row, _ in written]
+    )
+    await notify_interested_users([(row.id, job) for row, job in created], domain)
+    return rows
+
+
+async def notify_interested_users(jobs: List[Tuple[int, ScrapedJob]], domain: str) -> Dict[int, List[int]]:
+    interested = interest_index.users_for_jobs(jobs, domain)
+    for user_id, job_ids in interested.items():
+        feed_refresher.schedule(user_id, job_ids)
+        await notification_manager.notify_new_jobs(user_id, job_ids)
+    if interested:
+        logger.info(f"{len(jobs)} new {_key(domain)} jobs matched {len(interested)} users")
+    return interested
+
+
+async def _load_watermarks(db: AsyncSession, scope: str) -> Dict[str, ScrapeWatermark]:
+    result = await db.execute(select(ScrapeWatermark).where(ScrapeWatermark.scope == scope))
+    return {mark.source: mark for mark in result.scalars().all()}
+
+
+async def _advance_watermarks(db: AsyncSession, scope: str, result: SearchResult, started_at: datetime):
+    # A source that failed or was skipped keeps its old marks, so the next run
+    # re-fetches the window it missed. A source that hit max_per_source keeps its
+    # high-water mark too: feeds are scanned newest first, so the postings past the
+    # cap are older than everything collected and a later mark would skip them.
+    marks = await _load_watermarks(db, scope)
+    for source in result.succeeded:
+        mark = marks.get(source)
+        if mark is None:
+            mark = ScrapeWatermark(source=source, scope=scope)
+            db.add(mark)
+        mark.last_run_at = started_at
+
+        source_jobs = [job for job in result.jobs if job.source == source]
+        if not source_jobs or source in result.capped:
+            continue
+        dated = [_aware(job.posted_at) for job in source_jobs if job.posted_at]
+        newest = max(dated) if dated else started_at
+        current = _aware(mark.high_water_mark)
+        mark.high_water_mark = max(current, newest) if current else newest
+    await db.commit()
+
+
+async def last_ingested_at(db: AsyncSession, domain: str, location: str) -> Optional[datetime]:
+    result = await db.execute(
+        select(func.max(ScrapeWatermark.last_run_at)).where(ScrapeWatermark.scope == _scope(domain, location))
+    )
+    return _aware(result.scalar_one_or_none())
+
+
+async def _rank_by_similarity(db: AsyncSession, filters: list, query: str, limit: int) -> List[Job]:
+    result = await db.execute(select(Job.id, Job.simhash).where(*filters))
+    fingerprints = dict(result.all())
+    eligible = list(fingerprints)
+    missing = await asyncio.to_thread(embedding_index.missing, fingerprints)
+    if missing:
+        # Rows stored before the index existed, by another process, or under an id the
+        # index last saw on a different posting (e.g. after a database reset).
+        result = await db.execute(select(Job).where(Job.id.in_(missing)))
+        jobs = list(result.scalars().all())
+        await asyncio.to_thread(
+            embedding_index.upsert, [(job.id, job_to_scraped(job)) for job in jobs], [job.simhash for job in jobs]
+        )
+
+    ranked = await asyncio.to_thread(
+        lambda: embedding_index.top_k(embedding_index.embed_query(query), limit, eligible)
+    )
+    if not ranked:
+        return []
+    result = await db.execute(select(Job).where(Job.id.in_([job_id for job_id, _ in ranked])))
+    by_id = {job.id: job for job in result.scalars().all()}
+    return [by_id[job_id] for job_id, _ in ranked if job_id in by_id]
+
+
+async def load_corpus(
+    db: AsyncSession,
+    domain: str,
+    location: str,
+    limit: Optional[int] = None,
+    query: Optional[str] = None,
+    require_fresh: bool = True,
+) -> List[Job]:
+    now = datetime.now(timezone.utc)
+    if require_fresh:
+        last_run = await last_ingested_at(db, domain, location)
+        if last_run is None or last_run < now - timedelta(minutes=settings.DISCOVER_CORPUS_MAX_AGE_MINUTES):
+            return []
+
+    # Incremental runs only touch new postings, so older rows stay in the corpus
+    # for the retention window rather than the ingestion interval.
+    in_scope = select(JobScope.job_id).where(
+        JobScope.domain == _key(domain),
+        JobScope.location == location,
+        JobScope.scraped_at >= now - timedelta(days=settings.JOB_RETENTION_DAYS),
+    )
+    filters = [Job.id.in_(in_scope), Job.is_active == True]
+    limit = limit or settings.DISCOVER_CANDIDATE_LIMIT
+    if query:
+        return await _rank_by_similarity(db, filters, query, limit)
+
+    result = await db.execute(
+        select(Job)
+        .where(*filters)
+        .order_by(Job.scraped_at.desc(), Job.posted_at.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+class JobIngestionService:
+    def __init__(self, http_client: Optional[ScraperHTTPClient] = None):
+        self.scraper = JobScraper(http_client)
+        self.scheduler = AsyncIOScheduler()
+
+    def start(self):
+        self.scheduler.add_job(
+            self.run_once,
+            "interval",
+            minutes=settings.INGESTION_INTERVAL_MINUTES,
+            next_run_time=datetime.now(timezone.utc),
+            max_instances=1,
+            coalesce=True,
+            id="job_ingestion",
+        )
+        self.scheduler.start()
+        logger.info(f"Job ingestion scheduled every {settings.INGESTION_INTERVAL_MINUTES} min.")
+
+    def shutdown(self):
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+
+    async def run_once(self):
+        slots = asyncio.Semaphore(settings.INGESTION_CONCURRENCY)
+
+        async def ingest_one(domain: str, location: str):
+            async with slots:
+                try:
+                    await self.ingest(domain, location)
+                except Exception as e:
+                    logger.error(f"Ingestion failed for {domain} @ {location}: {e}")
+
+        await asyncio.gather(*[
+            ingest_one(domain.value, location)
+            for domain in JobDomain
+            for location in settings.INGESTION_LOCATIONS
+        ])
+        logger.info(f"Job ingestion run complete. Feed cache: {response_cache.stats()}")
+
+    async def ingest(
+        self,
+        domain: str,
+        location: str,
+        skills: Optional[List[str]] = None,
+        experience_level: Optional[str] = None,
+    ) -> List[Job]:
+        # Watermarks belong to the shared domain/location query. A scrape narrowed to
+        # one user's skills or level neither reads nor advances them.
+        shared = skills is None and experience_level is None
+        scope = _scope(domain, location)
+        started_at = datetime.now(timezone.utc)
+        overlap = timedelta(minutes=settings.INGESTION_OVERLAP_MINUTES)
+        since = {}
+        if shared:
+            async with AsyncSessionLocal() as db:
+                marks = await _load_watermarks(db, scope)
+            since = {
+                source: _aware(mark.high_water_mark) - overlap
+                for source, mark in marks.items()
+                if mark.high_water_mark
+            }
+
+        result = await self.scraper.search_jobs(
+            domain=_key(domain),
+            skills=skills,
+            location=location,
+            experience_level=_key(experience_level or "fresher"),
+            max_per_source=settings.INGESTION_MAX_PER_SOURCE,
+            since=since,
+        )
+        async with AsyncSessionLocal() as db:
+            rows = await upsert_scraped_jobs(db, result.jobs, domain, location)
+            if shared:
+                await _advance_watermarks(db, scope, result, started_at)
+        logger.info(f"Ingested {len(rows)} new or updated jobs for {_key(domain)} @ {location}")
+        return rows
@@ -1,28 +1,20 @@
 import asyncio
-import httpx
+import math
 from bs4 import BeautifulSoup
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional
 from loguru import logger
-from dataclasses import dataclass
-
-
-@dataclass
-class ScrapedJob:
-    title: str
-    company: str
-    location: str
-    job_type: str
-    description: str
-    application_url: str
-    source: str
-    posted_at: Optional[datetime] = None
-    experience_required: Optional[str] = None
-    requirements: List[str] = None
-
-    def __post_init__(self):
-        if self.requirements is None:
-            self.requirements = []
+from app.config import settings
+from app.scrapers.circuit_breaker import (
+    CircuitOpenError, SourceUnavailableError, get_circuit_breaker, parse_retry_after,
+)
+from app.scrapers.dedup import dedupe_jobs
+from app.scrapers.indeed_parser import parse_indeed_results
+from app.scrapers.matcher import FeedMatcher, get_feed_matcher
+from app.scrapers.scraped_job import ScrapedJob
+from app.scrapers.http_client import ScraperHTTPClient, scraper_http_client
+from app.scrapers.response_cache import ResponseCache, response_cache
+from app.scrapers.single_flight import SingleFlight
 
 
 class IndeedScraper:
@@ -32,55 +24,62 @@ class IndeedScraper:
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
     }
-
-    async def search(self, query: str, location: str = "United States", max_results: int = 20) -> List[ScrapedJob]:
+    PAGE_SIZE = 10
+
+    def __init__(self, http_client: ScraperHTTPClient):
+        self.http = http_client
+
+    @staticmethod
+    def _fromage(since: Optional[datetime]) -> int:
+        if since is None:
+            return 14
+        days = (datetime.now(timezone.utc) - since).total_seconds() / 86400
+        return max(1, min(14, math.ceil(days)))
+
+    async def _fetch_page(self, query: str, location: str, start: int, fromage: int = 14) -> List[ScrapedJob]:
+        # limit must match the step between page offsets or consecutive pages overlap.
+        params = {"q": query, "l": location, "limit": self.PAGE_SIZE, "fromage": fromage, "start": start}
+        response = await self.http.get(self.BASE_URL, params=params, headers=self.HEADERS)
+        if response.status_code in (403, 429) or response.status_code >= 500:
+            raise SourceUnavailableError(
+                "indeed", response.status_code, parse_retry_after(response.headers.get("Retry-After"))
+            )
+        if response.status_code != 200:
+            logger.warning(f"Indeed returned {response.status_code} for start={start}")
+            return []
+        return await parse_indeed_results(response.text, self.PAGE_SIZE)
+
+    async def search(
+        self,
+        query: str,
+        location: str = "United States",
+        max_results: int = 20,
+        since: Optional[datetime] = None,
+    ) -> List[ScrapedJob]:
         jobs = []
-        params = {"q": query, "l": location, "limit": min(max_results, 50), "fromage": 14}
+        pages = max(1, min(settings.INDEED_MAX_PAGES, math.ceil(max_results / self.PAGE_SIZE)))
+        fromage = self._fromage(since)
 
-        try:
-            async with httpx.AsyncClient(headers=self.HEADERS, follow_redirects=True, timeout=30) as client:
-                response = await client.get(self.BASE_URL, params=params)
-                if response.status_code != 200:
-                    logger.warning(f"Indeed returned {response.status_code}")
-                    return jobs
-
-                soup = BeautifulSoup(response.text, "lxml")
-                job_cards = soup.find_all("div", {"class": lambda c: c and "job_seen_beacon" in c})
-
-                for card in job_cards[:max_results]:
-                    try:
-                        title_el = card.find("h2", {"class": lambda c: c and "jobTitle" in c})
-                        title = title_el.get_text(strip=True) if title_el else "N/A"
-
-                        company_el = card.find("span", {"data-testid": "company-name"})
-                        company = company_el.get_text(strip=True) if company_el else "N/A"
-
-                        loc_el = card.find("div", {"data-testid": "text-location"})
-                        location_text = loc_el.get_text(strip=True) if loc_el else "Remote"
-
-                        link_el = card.find("a", {"class": lambda c: c and "jcs-JobTitle" in c})
-                        job_url = f"https://www.indeed.com{link_el['href']}" if link_el and link_el.get("href") else ""
-
-                        snippet_el = card.find("div", {"class": lambda c: c and "job-snippet" in c})
-                        description = snippet_el.get_text(strip=True) if snippet_el else ""
-
-                        jobs.append(ScrapedJob(
-                            title=title,
-                            company=company,
-                            location=location_text,
-                            job_type="full-time",
-                            description=description,
-                            application_url=job_url,
-                            source="indeed",
-                        ))
-                    except Exception as e:
-                        logger.debug(f"Error parsing Indeed job card: {e}")
-                        continue
+        results = await asyncio.gather(
+            *[self._fetch_page(query, location, page * self.PAGE_SIZE, fromage) for page in range(pages)],
+            return_exceptions=True,
+        )
 
-        except Exception as e:
-            logger.error(f"Indeed scraper error: {e}")
+        errors = [r for r in results if not isinstance(r, list)]
+        if errors and len(errors) == len(results):
+            raise errors[0]
 
-        return jobs
+        seen_urls = set()
+        for result in results:
+            if not isinstance(result, list):
+                logger.error(f"Indeed scraper error: {result}")
+                continue
+            for job in result:
+                if job.application_url not in seen_urls:
+                    seen_urls.add(job.application_url)
+                    jobs.append(job)
+
+        return jobs[:max_results]
 
 
 class RemoteOKScraper:
@@ -92,7 +91,7 @@ class RemoteOKScraper:
 
     DOMAIN_TAGS = {
         "software_engineering": ["dev", "software", "engineer", "backend", "fullstack"],
-        "data_science": ["data", "analytics", "analyst", "bi", "sql"],
+        "data_science": ["data", "analytics", "analyst", "bi", "sql", "data-science", "data-analyst", "data-engineer"],
         "machine_learning": ["ai", "ml", "machine-learning", "deep-learning", "nlp"],
         "devops": ["devops", "sre", "infrastructure", "cloud", "kubernetes"],
         "frontend": ["frontend", "react", "vue", "angular", "javascript"],
@@ -104,59 +103,77 @@ class RemoteOKScraper:
         "ui_ux": ["design", "ui", "ux", "figma", "product-design"],
         "qa_testing": ["qa", "testing", "automation", "selenium"],
         "product_management": ["product", "product-manager", "pm"],
-        "data_science": ["data-science", "data-analyst", "data-engineer"],
     }
 
-    async def search(self, domain: str, skills: List[str] = None, max_results: int = 20) -> List[ScrapedJob]:
+    def __init__(self, http_client: ScraperHTTPClient, cache: Optional[ResponseCache] = None):
+        self.http = http_client
+        self.cache = cache or response_cache
+
+    async def search(
+        self,
+        domain: str,
+        skills: List[str] = None,
+        max_results: int = 20,
+        since: Optional[datetime] = None,
+    ) -> List[ScrapedJob]:
+        min_epoch = since.timestamp() if since else None
+        if settings.REMOTEOK_STREAM_FEED:
+            data = await self.cache.iter_json_items(self.http, self.API_URL, headers=self.HEADERS)
+        else:
+            data = await self.cache.get_json(self.http, self.API_URL, headers=self.HEADERS)
+        matcher = get_feed_matcher(self.DOMAIN_TAGS.get(domain, ["software", "dev"]), (skills or [])[:5])
+        # Streaming reads the cached file while iterating, and each match is run
+        # through BeautifulSoup, so the scan runs in a worker thread.
+        return await asyncio.to_thread(self._collect, data, matcher, min_epoch, max_results)
+
+    @staticmethod
+    def _collect(data: Iterable[Any], matcher: FeedMatcher, min_epoch: Optional[float], max_results: int) -> List[ScrapedJob]:
         jobs = []
         try:
-            async with httpx.AsyncClient(headers=self.HEADERS, timeout=30) as client:
-                response = await client.get(self.API_URL)
-                if response.status_code != 200:
-                    logger.warning(f"RemoteOK returned {response.status_code}")
-                    return jobs
-
-                data = response.json()
-                tags = self.DOMAIN_TAGS.get(domain, ["software", "dev"])
-
-                for item in data:
-                    if not isinstance(item, dict) or "position" not in item:
-                        continue
-
-                    job_tags = [t.lower() for t in item.get("tags", [])]
-                    if not any(tag in job_tags for tag in tags):
-                        if skills:
-                            skill_match = any(s.lower() in str(item).lower() for s in skills[:5])
-                            if not skill_match:
-                                continue
-                        else:
-                            continue
-
-                    jobs.append(ScrapedJob(
-                        title=item.get("position", "N/A"),
-                        company=item.get("company", "N/A"),
-                        location=item.get("location", "Remote"),
-                        job_type="remote",
-                        description=BeautifulSoup(item.get("description", ""), "lxml").get_text()[:1000],
-                        application_url=item.get("url", f"https://remoteok.com/remote-jobs/{item.get('id', '')}"),
-                        source="remoteok",
-                        posted_at=datetime.fromtimestamp(item["epoch"], tz=timezone.utc) if item.get("epoch") else None,
-                        requirements=item.get("tags", []),
-                    ))
-
-                    if len(jobs) >= max_results:
-                        break
+            for item in data:
+                if not isinstance(item, dict) or "position" not in item:
+                    continue
+                if min_epoch is not None and (item.get("epoch") or 0) < min_epoch:
+                    continue
+                if not matcher.matches(item):
+                    continue
+
+                jobs.append(ScrapedJob(
+                    title=item.get("position", "N/A"),
+                    company=item.get("company", "N/A"),
+                    location=item.get("location", "Remote"),
+                    job_type="remote",
+                    description=BeautifulSoup(item.get("description", ""), "lxml").get_text()[:1000],
+                    application_url=item.get("url", f"https://remoteok.com/remote-jobs/{item.get('id', '')}"),
+                    source="remoteok",
+                    posted_at=datetime.fromtimestamp(item["epoch"], tz=timezone.utc) if item.get("epoch") else None,
+                    requirements=item.get("tags", []),
+                ))
+
+                if len(jobs) >= max_results:
+                    break
 
         except Exception as e:
-            logger.error(f"RemoteOK scraper error: {e}")
+            logger.error(f"RemoteOK feed parse error: {e}")
 
         return jobs
 
 
+class SearchResult(NamedTuple):
+    jobs: List[ScrapedJob]
+    # Sources that answered; failed or circuit-broken sources are missing.
+    succeeded: FrozenSet[str]
+    # Sources that returned a full max_per_source page and may have had more.
+    capped: FrozenSet[str] = frozenset()
+
+
 class JobScraper:
-    def __init__(self):
-        self.remoteok = RemoteOKScraper()
-        self.indeed = IndeedScraper()
+    SOURCES = ("remoteok", "indeed")
+
+    def __init__(self, http_client: Optional[ScraperHTTPClient] = None):
+        self.http = http_client or scraper_http_client
+        self.remoteok = RemoteOKScraper(self.http)
+        self.indeed = IndeedScraper(self.http)
 
     async def search_jobs(
         self,
@@ -165,20 +182,52 @@ class JobScraper:
         location: str = "United States",
         experience_level: str = "fresher",
         max_per_source: int = 15,
-    ) -> List[ScrapedJob]:
+        since: Optional[Dict[str, datetime]] = None,
+    ) -> SearchResult:
+        since = since or {}
         query = self._build_query(domain, skills, experience_level)
+        key = (
+            domain,
+            " ".join(query.lower().split()),
+            # Exactly the skills the RemoteOK matcher sees, in order and normalised the
+            # way SkillAutomaton does ("react native" and "react-native" stay distinct).
+            tuple(" ".join(str(s).lower().split()) for s in (skills or [])[:5]),
+            " ".join(location.lower().split()),
+            max_per_source,
+            tuple(sorted((source, mark.isoformat()) for source, mark in since.items() if mark)),
+        )
+        result = await search_flight.do(
+            key, lambda: self._search_jobs(domain, skills, location, query, max_per_source, since)
+        )
+        return SearchResult(list(result.jobs), result.succeeded, result.capped)
+
+    async def _search_jobs(
+        self,
+        domain: str,
+        skills: Optional[List[str]],
+        location: str,
+        query: str,
+        max_per_source: int,
+        since: Dict[str, datetime],
+    ) -> SearchResult:
         logger.info(f"Searching jobs: domain={domain}, query='{query}'")
 
         results = await asyncio.gather(
-            self.remoteok.search(domain, skills, max_per_source),
-            self.indeed.search(query, location, max_per_source),
+            self._guarded("remoteok", lambda: self.remoteok.search(domain, skills, max_per_source, since.get("remoteok"))),
+            self._guarded("indeed", lambda: self.indeed.search(query, location, max_per_source, since.get("indeed"))),
             return_exceptions=True,
         )
 
         all_jobs = []
-        for result in results:
+        succeeded, capped = set(), set()
+        for source, result in zip(self.SOURCES, results):
             if isinstance(result, list):
                 all_jobs.extend(result)
+                succeeded.add(source)
+                if len(result) >= max_per_source:
+                    capped.add(source)
+            elif isinstance(result, CircuitOpenError):
+                logger.info(f"Skipping {result}")
             else:
                 logger.warning(f"Scraper error: {result}")
 
@@ -189,8 +238,24 @@ class JobScraper:
                 seen_urls.add(job.application_url)
                 unique_jobs.append(job)
 
+        unique_jobs = dedupe_jobs(unique_jobs)
         logger.info(f"Found {len(unique_jobs)} unique jobs")
-        return unique_jobs
+        return SearchResult(unique_jobs, frozenset(succeeded), frozenset(capped))
+
+    async def _guarded(self, source: str, search: Callable[[], Awaitable[List[ScrapedJob]]]) -> List[ScrapedJob]:
+        breaker = get_circuit_breaker(source)
+        if not breaker.allow_request():
+            raise CircuitOpenError(source, breaker.state)
+        try:
+            jobs = await search()
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+        return jobs
 
     def _build_query(self, domain: str, skills: List[str], experience_level: str) -> str:
         domain_query_map = {
@@ -221,3 +286,6 @@ class JobScraper:
         level = level_map.get(experience_level, "entry level")
         skill_str = f" {skills[0]}" if skills else ""
         return f"{base}{skill_str} {level}"
+
+
+search_flight = SingleFlight()
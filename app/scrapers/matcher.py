@@ -0,0 +1,111 @@
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+FEED_TEXT_FIELDS = ("position", "company", "location", "description")
+
+
+@lru_cache(maxsize=4096)
+def normalize_tag(tag: str) -> str:
+    return "-".join(str(tag).lower().replace("_", " ").split())
+
+
+# Multi-pattern skill matcher. The patterns are folded into a trie and the trie is
+# emitted as a single factored regex, so one C-level pass over the text tests every
+# skill at once (the same walk an Aho-Corasick automaton does, without a Python loop).
+class SkillAutomaton:
+    def __init__(self, patterns: Iterable[str], whole_words: bool = True):
+        self.patterns: List[str] = []
+        trie: Dict[str, dict] = {}
+        for pattern in patterns:
+            words = str(pattern).lower().split()
+            key = " ".join(words)
+            if not key or key in self.patterns:
+                continue
+            self.patterns.append(key)
+            node = trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+
+        self.whole_words = whole_words
+        self._regex = re.compile(self._trie_to_regex(trie) if self.patterns else "(?!)")
+
+    @classmethod
+    def _trie_to_regex(cls, node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = []
+        for ch in sorted(k for k in node if k):
+            token = r"\s+" if ch == " " else re.escape(ch)
+            branches.append(token + cls._trie_to_regex(node[ch]))
+
+        if not branches:
+            return ""
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if terminal else group
+
+    # Word boundaries are checked on the (rare) hits instead of inside the regex;
+    # a lookaround would be evaluated at every offset and triple the scan time.
+    def _is_word(self, text: str, start: int, end: int) -> bool:
+        if not self.whole_words:
+            return True
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
+
+    def iter_matches(self, text: str):
+        text = text.lower()
+        pos = 0
+        while True:
+            match = self._regex.search(text, pos)
+            if match is None:
+                return
+            start = match.start()
+            # The regex takes the longest pattern; if that one runs into a letter
+            # ("react native" in "react nativescript"), a shorter pattern from the same
+            # start may still end on a boundary, so retry with the text cut before it.
+            # Nothing shorter helps when the start itself is inside a word.
+            starts_word = not self.whole_words or start == 0 or not text[start - 1].isalnum()
+            while match is not None and not self._is_word(text, start, match.end()):
+                end = match.end() - 1
+                match = self._regex.match(text, start, end) if starts_word and end > start else None
+            if match is not None:
+                yield " ".join(match.group().split())
+                pos = match.end()
+            else:
+                pos = start + 1
+
+    def search(self, text: str) -> bool:
+        return next(self.iter_matches(text), None) is not None
+
+    def find_all(self, text: str) -> Set[str]:
+        return set(self.iter_matches(text))
+
+
+class FeedMatcher:
+    def __init__(self, tags: Iterable[str], skills: Iterable[str] = ()):
+        self.tags: FrozenSet[str] = frozenset(normalize_tag(t) for t in tags)
+        skills = [s for s in skills if s]
+        self.skills: Optional[SkillAutomaton] = SkillAutomaton(skills) if skills else None
+
+    def matches(self, item: dict) -> bool:
+        item_tags = item.get("tags") or []
+        if any(normalize_tag(str(t)) in self.tags for t in item_tags):
+            return True
+        if self.skills is None:
+            return False
+
+        parts = [str(item.get(field) or "") for field in FEED_TEXT_FIELDS]
+        parts.extend(str(t) for t in item_tags)
+        return self.skills.search("\n".join(parts))
+
+
+@lru_cache(maxsize=1024)
+def _compiled(tags: Tuple[str, ...], skills: Tuple[str, ...]) -> FeedMatcher:
+    return FeedMatcher(tags, skills)
+
+
+def get_feed_matcher(tags: Iterable[str], skills: Iterable[str] = ()) -> FeedMatcher:
+    return _compiled(tuple(tags), tuple(skills or ()))
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+from app.config import settings
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        host_rates: Optional[Dict[str, float]] = None,
+    ):
+        self.rate = rate or settings.SCRAPER_RATE_PER_SECOND
+        self.burst = burst or settings.SCRAPER_RATE_BURST
+        self.host_rates = dict(settings.SCRAPER_HOST_RATES if host_rates is None else host_rates)
+        self.max_concurrency = max_concurrency or settings.SCRAPER_MAX_CONCURRENT_REQUESTS
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._concurrency: Optional[asyncio.Semaphore] = None
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.host_rates.get(host, self.rate), self.burst)
+        return self._buckets[host]
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        if self._concurrency is None:
+            self._concurrency = asyncio.Semaphore(self.max_concurrency)
+        await self._bucket(urlsplit(url).netloc).acquire()
+        async with self._concurrency:
+            yield
+
+
+rate_limiter = HostRateLimiter()
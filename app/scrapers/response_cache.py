@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, Optional
+import httpx
+from loguru import logger
+from app.config import settings
+from app.scrapers.feed_stream import CHUNK_SIZE, iter_json_array, read_chunks
+from app.scrapers.http_client import ScraperHTTPClient
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ResponseCache:
+    def __init__(self, cache_dir: str = None, ttl_seconds: int = None):
+        self.cache_dir = cache_dir or settings.SCRAPER_CACHE_DIR
+        self.ttl_seconds = settings.SCRAPER_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._entries: Dict[str, CacheEntry] = {}
+        self._parsed: Dict[str, Any] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.body"
+
+    def _lock(self, url: str) -> asyncio.Lock:
+        if url not in self._locks:
+            self._locks[url] = asyncio.Lock()
+        return self._locks[url]
+
+    def _load_entry(self, url: str) -> Optional[CacheEntry]:
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        try:
+            with open(meta_path) as f:
+                return CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Discarding unreadable cache entry for {url}: {e}")
+            return None
+
+    def _touch(self, entry: CacheEntry):
+        meta_path, _ = self._paths(entry.url)
+        with open(meta_path, "w") as f:
+            json.dump(asdict(entry), f)
+
+    def _read_body(self, url: str) -> bytes:
+        _, body_path = self._paths(url)
+        with open(body_path, "rb") as f:
+            return f.read()
+
+    async def _parsed_body(self, url: str) -> Any:
+        if url not in self._parsed:
+            body = await asyncio.to_thread(self._read_body, url)
+            self._parsed[url] = await asyncio.to_thread(json.loads, body)
+        return self._parsed[url]
+
+    def _is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl_seconds
+
+    async def fetch_to_disk(self, http: ScraperHTTPClient, url: str, headers: Dict[str, str] = None) -> str:
+        _, body_path = self._paths(url)
+        async with self._lock(url):
+            entry = self._entries.get(url) or await asyncio.to_thread(self._load_entry, url)
+            if entry and self._is_fresh(entry):
+                self._entries[url] = entry
+                self.hits += 1
+                return body_path
+
+            request_headers = dict(headers or {})
+            if entry and entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry and entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+            try:
+                async with http.stream("GET", url, headers=request_headers) as response:
+                    if response.status_code == 304 and entry:
+                        self.revalidations += 1
+                        entry.fetched_at = time.time()
+                        self._entries[url] = entry
+                        await asyncio.to_thread(self._touch, entry)
+                        return body_path
+
+                    if response.status_code != 200:
+                        if entry:
+                            logger.warning(f"{url} returned {response.status_code}; serving stale cache")
+                            return body_path
+                        response.raise_for_status()
+
+                    tmp_path = f"{body_path}.part"
+                    f = await asyncio.to_thread(open, tmp_path, "wb")
+                    try:
+                        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                            await asyncio.to_thread(f.write, chunk)
+                    finally:
+                        await asyncio.to_thread(f.close)
+                    await asyncio.to_thread(os.replace, tmp_path, body_path)
+                    headers_in = response.headers
+            except httpx.HTTPStatusError:
+                raise
+            except Exception as e:
+                if entry:
+                    logger.warning(f"Serving stale cache for {url} after fetch error: {e}")
+                    return body_path
+                raise
+
+            self.misses += 1
+            entry = CacheEntry(
+                url=url,
+                fetched_at=time.time(),
+                etag=headers_in.get("ETag"),
+                last_modified=headers_in.get("Last-Modified"),
+            )
+            self._entries[url] = entry
+            self._parsed.pop(url, None)
+            await asyncio.to_thread(self._touch, entry)
+            return body_path
+
+    async def get_json(self, http: ScraperHTTPClient, url: str, headers: Dict[str, str] = None) -> Any:
+        await self.fetch_to_disk(http, url, headers)
+        return await self._parsed_body(url)
+
+    async def iter_json_items(self, http: ScraperHTTPClient, url: str, headers: Dict[str, str] = None) -> Iterator[Any]:
+        # The iterator reads and decodes the file lazily; consume it off the event loop.
+        body_path = await self.fetch_to_disk(http, url, headers)
+        return iter_json_array(read_chunks(body_path))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses + self.revalidations
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_rate": round((self.hits + self.revalidations) / total, 3) if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class ScrapedJob:
+    title: str
+    company: str
+    location: str
+    job_type: str
+    description: str
+    application_url: str
+    source: str
+    posted_at: Optional[datetime] = None
+    experience_required: Optional[str] = None
+    requirements: List[str] = None
+
+    def __post_init__(self):
+        if self.requirements is None:
+            self.requirements = []
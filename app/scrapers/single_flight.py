@@ -0,0 +1,54 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from app.config import settings
+
+
+class SingleFlight:
+    # Concurrent calls with the same key share one execution; its result is then
+    # reused for ttl seconds. Failures are not cached. The shared work runs as its
+    # own task, so a caller that is cancelled does not cancel it for the others.
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = settings.SCRAPER_SINGLE_FLIGHT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def _cached(self, key: Hashable):
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl_seconds:
+            del self._results[key]
+            return None
+        return entry
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._cached(key)
+        if entry is not None:
+            self.shared += 1
+            return entry[1]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is None and self.ttl_seconds > 0:
+            self._results[key] = (time.monotonic(), task.result())
+        if len(self._results) > 256:
+            now = time.monotonic()
+            for stale in [k for k, (at, _) in self._results.items() if now - at > self.ttl_seconds]:
+                del self._results[stale]
+
+    def stats(self) -> dict:
+        return {"executions": self.executions, "shared": self.shared, "in_flight": len(self._in_flight)}
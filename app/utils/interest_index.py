@@ -0,0 +1,106 @@
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from loguru import logger
+from sqlalchemy import select
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.profile import UserProfile
+from app.scrapers.matcher import SkillAutomaton
+from app.scrapers.scraped_job import ScrapedJob
+
+
+def _phrase(value: str) -> str:
+    return " ".join(str(value).lower().replace("_", " ").split())
+
+
+def _domain(value) -> str:
+    return str(getattr(value, "value", value) or "")
+
+
+def profile_keys(profile) -> Set[str]:
+    keys = set()
+    keys.update(f"skill:{_phrase(s)}" for s in profile.skills or [] if _phrase(s))
+    keys.update(f"role:{_phrase(r)}" for r in profile.target_roles or [] if _phrase(r))
+    return keys
+
+
+class InterestIndex:
+    # Posting lists from skill / target-role keys to user ids. New jobs are matched by
+    # scanning their text once with automatons built from the indexed vocabulary, so
+    # the cost depends on the job and the vocabulary, not the user count. The domain is
+    # a filter on the candidates, not a posting list: every user in a domain would sit
+    # on it, and it would count towards the overlap threshold.
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.user_keys: Dict[int, Set[str]] = {}
+        self.user_domains: Dict[int, str] = {}
+        self._skills: Optional[SkillAutomaton] = None
+        self._roles: Optional[SkillAutomaton] = None
+
+    def update_profile(self, profile):
+        self.remove_user(profile.user_id)
+        keys = profile_keys(profile)
+        self.user_keys[profile.user_id] = keys
+        self.user_domains[profile.user_id] = _domain(profile.domain)
+        for key in keys:
+            if key not in self.postings:
+                self._skills = self._roles = None
+            self.postings[key].add(profile.user_id)
+
+    def remove_user(self, user_id: int):
+        self.user_domains.pop(user_id, None)
+        for key in self.user_keys.pop(user_id, ()):
+            users = self.postings.get(key)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self.postings[key]
+
+    async def rebuild(self):
+        self.postings.clear()
+        self.user_keys.clear()
+        self.user_domains.clear()
+        self._skills = self._roles = None
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(UserProfile))
+            for profile in result.scalars().all():
+                self.update_profile(profile)
+        logger.info(f"Interest index built for {len(self.user_keys)} users, {len(self.postings)} keys")
+
+    def _automatons(self) -> Tuple[SkillAutomaton, SkillAutomaton]:
+        if self._skills is None or self._roles is None:
+            skills = [k.split(":", 1)[1] for k in self.postings if k.startswith("skill:")]
+            roles = [k.split(":", 1)[1] for k in self.postings if k.startswith("role:")]
+            self._skills = SkillAutomaton(skills)
+            self._roles = SkillAutomaton(roles)
+        return self._skills, self._roles
+
+    def job_keys(self, job: ScrapedJob) -> Set[str]:
+        skills, roles = self._automatons()
+        text = " ".join([job.title, " ".join(job.requirements or []), job.description or ""])
+        keys = set()
+        keys.update(f"skill:{s}" for s in skills.find_all(text))
+        keys.update(f"role:{r}" for r in roles.find_all(job.title))
+        return keys
+
+    def users_for_job(self, job: ScrapedJob, domain: str, min_overlap: Optional[int] = None) -> Dict[int, int]:
+        min_overlap = min_overlap or settings.INTEREST_MIN_OVERLAP
+        overlap: Counter = Counter()
+        for key in self.job_keys(job):
+            overlap.update(self.postings.get(key, ()))
+        domain = _domain(domain)
+        return {
+            user_id: hits
+            for user_id, hits in overlap.items()
+            if hits >= min_overlap and self.user_domains.get(user_id) == domain
+        }
+
+    def users_for_jobs(self, jobs: Iterable[Tuple[int, ScrapedJob]], domain: str) -> Dict[int, List[int]]:
+        interested: Dict[int, List[int]] = defaultdict(list)
+        for job_id, job in jobs:
+            for user_id in self.users_for_job(job, domain):
+                interested[user_id].append(job_id)
+        return dict(interested)
+
+
+interest_index = InterestIndex()
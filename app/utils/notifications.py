@@ -1,5 +1,5 @@
 import asyncio
-from typing import Dict, Set, Optional
+from typing import Dict, List, Set, Optional
 from fastapi import WebSocket
 from loguru import logger
 import json
@@ -57,6 +57,26 @@ class NotificationManager:
             "message": f"❌ Application failed: {reason}",
         })
 
+    async def notify_new_jobs(self, user_id: int, job_ids: List[int]):
+        await self.send_to_user(user_id, {
+            "type": "new_jobs",
+            "job_ids": job_ids,
+            "message": f"🆕 {len(job_ids)} new job(s) match your profile",
+        })
+
+    async def notify_cover_letter_chunk(
+        self, user_id: int, application_id: int, chunk: str, done: bool = False, error: Optional[str] = None
+    ):
+        message = {
+            "type": "cover_letter_chunk",
+            "application_id": application_id,
+            "chunk": chunk,
+            "done": done,
+        }
+        if error:
+            message["error"] = error
+        await self.send_to_user(user_id, message)
+
     async def notify_progress(self, user_id: int, application_id: int, message: str):
         await self.send_to_user(user_id, {
             "type": "progress",
@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from typing import NamedTuple, Optional
+from fastapi import UploadFile
+from app.config import settings
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class UploadTooLargeError(Exception):
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"Upload exceeds {limit} bytes")
+
+
+class StoredFile(NamedTuple):
+    content_hash: str
+    path: str
+    size: int
+    created: bool
+
+
+def _write_chunk(f, digest, chunk: bytes):
+    digest.update(chunk)
+    f.write(chunk)
+
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _commit(tmp: str, final: str) -> bool:
+    if os.path.exists(final):
+        os.remove(tmp)
+        return False
+    os.makedirs(os.path.dirname(final), exist_ok=True)
+    os.replace(tmp, final)
+    return True
+
+
+class ResumeStorage:
+    # Files live at <root>/<aa>/<bb>/<sha256><ext>: identical uploads from any user
+    # share one copy, and a path never changes once written. Uploads are streamed to
+    # a temp file in chunks, hashed on the way, and only moved into place when complete.
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = root or settings.RESUME_STORAGE_DIR
+        self.max_bytes = max_bytes or settings.RESUME_MAX_UPLOAD_BYTES
+
+    def path_for(self, content_hash: str, extension: str) -> str:
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], f"{content_hash}{extension.lower()}")
+
+    async def save(self, upload: UploadFile, extension: str) -> StoredFile:
+        tmp_dir = os.path.join(self.root, "tmp")
+        await asyncio.to_thread(os.makedirs, tmp_dir, exist_ok=True)
+        tmp = os.path.join(tmp_dir, f"{uuid.uuid4().hex}.part")
+        digest = hashlib.sha256()
+        size = 0
+        f = await asyncio.to_thread(open, tmp, "wb")
+        try:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise UploadTooLargeError(self.max_bytes)
+                await asyncio.to_thread(_write_chunk, f, digest, chunk)
+        except BaseException:
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(_discard, tmp)
+            raise
+        await asyncio.to_thread(f.close)
+
+        content_hash = digest.hexdigest()
+        final = self.path_for(content_hash, extension)
+        created = await asyncio.to_thread(_commit, tmp, final)
+        return StoredFile(content_hash, final, size, created)
+
+
+resume_storage = ResumeStorage()
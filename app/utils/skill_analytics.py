@@ -0,0 +1,219 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from loguru import logger
+from sqlalchemy import select
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.job import Job
+from app.models.job_scope import JobScope
+from app.scrapers.matcher import normalize_tag
+
+JobRow = Tuple[Optional[str], Sequence[str], Optional[datetime]]
+
+
+def _day(value: Optional[datetime]) -> int:
+    if value is None:
+        return -1
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() // 86400)
+
+
+class SkillMatrix:
+    # Job x skill incidence matrix in CSR form (indptr / indices), plus per-job
+    # domain codes and posting days. Per-domain skill counts and weekly posting
+    # counts are aggregated once at build time; a per-user query only touches the
+    # non-zeros of the user's domain, all in NumPy.
+    def __init__(self, rows: Iterable[JobRow], weeks: Optional[int] = None, now: Optional[datetime] = None):
+        self.weeks = weeks or settings.SKILL_ANALYTICS_TREND_WEEKS
+        self.built_at = now or datetime.now(timezone.utc)
+        self.skills: List[str] = []
+        self.domains: List[str] = []
+        skill_ids: Dict[str, int] = {}
+        domain_ids: Dict[str, int] = {}
+        # Rows are grouped by domain so each domain is a contiguous slice of the matrix.
+        grouped: List[List[Tuple[List[int], int]]] = []
+        for domain, tags, posted in rows:
+            domain = domain or "other"
+            if domain not in domain_ids:
+                domain_ids[domain] = len(self.domains)
+                self.domains.append(domain)
+                grouped.append([])
+            row = set()
+            for tag in tags:
+                key = normalize_tag(tag)
+                if not key:
+                    continue
+                if key not in skill_ids:
+                    skill_ids[key] = len(self.skills)
+                    self.skills.append(key)
+                row.add(skill_ids[key])
+            grouped[domain_ids[domain]].append((list(row), _day(posted)))
+
+        indptr = [0]
+        indices: List[int] = []
+        domain_codes: List[int] = []
+        days: List[int] = []
+        self.domain_rows: List[Tuple[int, int]] = []
+        for domain_id, domain_rows in enumerate(grouped):
+            start = len(domain_codes)
+            for row, day in domain_rows:
+                indices.extend(row)
+                indptr.append(len(indices))
+                domain_codes.append(domain_id)
+                days.append(day)
+            self.domain_rows.append((start, len(domain_codes)))
+
+        self.skill_ids = skill_ids
+        self.domain_ids = domain_ids
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.domain_codes = np.asarray(domain_codes, dtype=np.int32)
+        self.row_lengths = np.diff(self.indptr)
+        self.nnz_rows = np.repeat(np.arange(len(domain_codes), dtype=np.int32), self.row_lengths)
+
+        n_domains, n_skills = max(len(self.domains), 1), max(len(self.skills), 1)
+        nnz_domains = self.domain_codes[self.nnz_rows]
+        self.domain_skill_counts = np.bincount(
+            nnz_domains.astype(np.int64) * n_skills + self.indices, minlength=n_domains * n_skills
+        ).reshape(n_domains, n_skills)
+        self.domain_job_counts = np.bincount(self.domain_codes, minlength=n_domains)
+
+        days = np.asarray(days, dtype=np.int64)
+        age_weeks = (_day(self.built_at) - days) // 7
+        recent = (days >= 0) & (age_weeks >= 0) & (age_weeks < self.weeks)
+        # Column 0 is the oldest week, the last column the current one.
+        self.weekly_postings = np.bincount(
+            self.domain_codes[recent].astype(np.int64) * self.weeks + (self.weeks - 1 - age_weeks[recent]),
+            minlength=n_domains * self.weeks,
+        ).reshape(n_domains, self.weeks)
+
+    @property
+    def job_count(self) -> int:
+        return len(self.domain_codes)
+
+    def _user_mask(self, skills: Iterable[str]) -> np.ndarray:
+        mask = np.zeros(max(len(self.skills), 1), dtype=bool)
+        for skill in skills:
+            skill_id = self.skill_ids.get(normalize_tag(skill))
+            if skill_id is not None:
+                mask[skill_id] = True
+        return mask
+
+    def skills_gap(self, domain: str, skills: Sequence[str], top: int = 10) -> dict:
+        domain_id = self.domain_ids.get(domain)
+        if domain_id is None or not self.domain_job_counts[domain_id]:
+            return {"domain": domain, "jobs_analyzed": 0, "coverage": None, "missing_skills": [], "your_skills": []}
+
+        has = self._user_mask(skills)
+        demand = self.domain_skill_counts[domain_id]
+        jobs_in_domain = int(self.domain_job_counts[domain_id])
+
+        first, last = self.domain_rows[domain_id]
+        lo, hi = self.indptr[first], self.indptr[last]
+        lengths = self.row_lengths[first:last]
+        hits = np.bincount(
+            self.nnz_rows[lo:hi] - first, weights=has[self.indices[lo:hi]], minlength=last - first
+        )
+        listed = lengths > 0
+        coverage = hits[listed] / lengths[listed]
+
+        missing = np.where(has, 0, demand)
+        top = min(top, int(np.count_nonzero(missing)))
+        best = np.argpartition(missing, -top)[-top:] if top else np.array([], dtype=np.int64)
+        best = best[np.argsort(missing[best])[::-1]]
+
+        return {
+            "domain": domain,
+            "jobs_analyzed": jobs_in_domain,
+            "coverage": {
+                "jobs_with_listed_skills": int(np.count_nonzero(listed)),
+                "mean": round(float(coverage.mean()), 3) if len(coverage) else None,
+                "median": round(float(np.median(coverage)), 3) if len(coverage) else None,
+                "jobs_majority_covered": int(np.count_nonzero(coverage >= 0.5)),
+                "jobs_fully_covered": int(np.count_nonzero(coverage >= 1.0)),
+            },
+            "missing_skills": [
+                {"skill": self.skills[i], "jobs": int(demand[i]), "share": round(float(demand[i]) / jobs_in_domain, 3)}
+                for i in best
+            ],
+            "your_skills": [
+                {
+                    "skill": skill,
+                    "jobs": int(demand[self.skill_ids[normalize_tag(skill)]]) if normalize_tag(skill) in self.skill_ids else 0,
+                }
+                for skill in skills
+            ],
+        }
+
+    def domain_trends(self) -> List[dict]:
+        order = np.argsort(self.weekly_postings.sum(axis=1))[::-1]
+        return [
+            {
+                "domain": self.domains[i],
+                "weekly_postings": self.weekly_postings[i].tolist(),
+                "total_jobs": int(self.domain_job_counts[i]),
+            }
+            for i in order
+            if i < len(self.domains)
+        ]
+
+
+class SkillAnalytics:
+    # Serves from the last built matrix and rebuilds it in the background once it
+    # is older than the TTL, so requests never wait on a corpus scan after warm-up.
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or settings.SKILL_ANALYTICS_TTL_SECONDS
+        self.matrix: Optional[SkillMatrix] = None
+        self.built = 0.0
+        self._rebuild: Optional[asyncio.Task] = None
+
+    async def _load(self) -> SkillMatrix:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.JOB_RETENTION_DAYS)
+        async with AsyncSessionLocal() as db:
+            # Job.domain only records the first scope a posting was found in; a job
+            # counts towards every domain it was ingested for within the retention window.
+            scopes = (
+                select(JobScope.job_id, JobScope.domain)
+                .where(JobScope.scraped_at >= cutoff)
+                .distinct()
+                .subquery()
+            )
+            result = await db.execute(
+                select(scopes.c.domain, Job.requirements, Job.match_keywords, Job.posted_at, Job.scraped_at)
+                .join(scopes, scopes.c.job_id == Job.id)
+                .where(Job.is_active == True)
+            )
+            rows = [
+                (domain, [*(requirements or []), *(keywords or [])], posted_at or scraped_at)
+                for domain, requirements, keywords, posted_at, scraped_at in result.all()
+            ]
+        start = time.perf_counter()
+        matrix = await asyncio.to_thread(SkillMatrix, rows)
+        logger.info(
+            f"Skill matrix built: {matrix.job_count} jobs x {len(matrix.skills)} skills "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+        self.matrix, self.built = matrix, time.monotonic()
+        return matrix
+
+    async def _refresh(self):
+        try:
+            await self._load()
+        except Exception as e:
+            logger.error(f"Skill matrix rebuild failed: {e}")
+
+    async def get_matrix(self) -> SkillMatrix:
+        if self.matrix is None:
+            if self._rebuild is None or self._rebuild.done():
+                self._rebuild = asyncio.ensure_future(self._load())
+            return await asyncio.shield(self._rebuild)
+        if time.monotonic() - self.built > self.ttl_seconds and (self._rebuild is None or self._rebuild.done()):
+            self._rebuild = asyncio.ensure_future(self._refresh())
+        return self.matrix
+
+
+skill_analytics = SkillAnalytics()
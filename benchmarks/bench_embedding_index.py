@@ -0,0 +1,86 @@
+"""Measure building, querying and reopening the on-disk job embedding index.
+
+The RemoteOK fixture is repeated to reach a corpus of CORPUS_SIZE jobs. The
+"whole corpus" query ranks every stored vector; the "filtered" query ranks a
+random half, as /discover does for one domain and location.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_embedding_index
+"""
+import json
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+from bs4 import BeautifulSoup
+
+from app.agents.embedding_index import EmbeddingIndex, profile_text
+from app.scrapers.scraped_job import ScrapedJob
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "remoteok_feed.json")
+CORPUS_SIZE = 20000
+QUERIES = 50
+
+
+def load_jobs():
+    with open(FIXTURE) as f:
+        feed = json.load(f)[1:]
+    return [
+        ScrapedJob(
+            title=item["position"],
+            company=item["company"],
+            location=item["location"],
+            job_type="remote",
+            description=BeautifulSoup(item["description"], "lxml").get_text(),
+            application_url=item["url"],
+            source="remoteok",
+            requirements=item["tags"],
+        )
+        for item in feed
+    ]
+
+
+def timed_ms(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    jobs = load_jobs()
+    corpus = [(job_id, jobs[job_id % len(jobs)]) for job_id in range(CORPUS_SIZE)]
+    profile = SimpleNamespace(
+        domain="backend",
+        skills=["Python", "FastAPI", "PostgreSQL", "Docker"],
+        target_roles=["Backend Engineer"],
+    )
+    query_text = profile_text(profile, "Built REST APIs with Python and FastAPI, deployed with Docker on AWS.")
+    subset = random.Random(0).sample(range(CORPUS_SIZE), CORPUS_SIZE // 2)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = EmbeddingIndex(directory)
+        build_ms = timed_ms(lambda: index.upsert(corpus))
+        append_ms = timed_ms(lambda: index.upsert([(CORPUS_SIZE + i, job) for i, job in enumerate(jobs[:30])]))
+        query = index.embed_query(query_text)
+        full_ms = timed_ms(lambda: index.top_k(query, 200), QUERIES)
+        filtered_ms = timed_ms(lambda: index.top_k(query, 200, subset), QUERIES)
+        del index
+
+        reopened = EmbeddingIndex(directory)
+        reload_ms = timed_ms(reopened.load)
+        size_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 2 ** 20
+
+    print(f"corpus: {CORPUS_SIZE} jobs, {size_mb:.1f} MB on disk")
+    print(f"{'build (embed + write)':<28}{build_ms:>10.0f} ms")
+    print(f"{'incremental append of 30':<28}{append_ms:>10.1f} ms")
+    print(f"{'top-200, whole corpus':<28}{full_ms:>10.2f} ms")
+    print(f"{'top-200, filtered half':<28}{filtered_ms:>10.2f} ms")
+    print(f"{'reopen (memory-mapped)':<28}{reload_ms:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare the legacy BeautifulSoup Indeed parser with the compiled lxml parser.
+
+Reports per-page parse time, and the worst event-loop stall while a burst of
+pages is parsed inline on the loop versus through the parser executor.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_indeed_parser
+"""
+import asyncio
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.indeed_parser import parse_indeed_html, parse_indeed_results, shutdown_parser_executor
+from app.scrapers.scraped_job import ScrapedJob
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "indeed_results.html")
+
+
+def legacy_parse(page: str, max_results: int = 50):
+    jobs = []
+    soup = BeautifulSoup(page, "lxml")
+    job_cards = soup.find_all("div", {"class": lambda c: c and "job_seen_beacon" in c})
+    for card in job_cards[:max_results]:
+        title_el = card.find("h2", {"class": lambda c: c and "jobTitle" in c})
+        company_el = card.find("span", {"data-testid": "company-name"})
+        loc_el = card.find("div", {"data-testid": "text-location"})
+        link_el = card.find("a", {"class": lambda c: c and "jcs-JobTitle" in c})
+        snippet_el = card.find("div", {"class": lambda c: c and "job-snippet" in c})
+        jobs.append(ScrapedJob(
+            title=title_el.get_text(strip=True) if title_el else "N/A",
+            company=company_el.get_text(strip=True) if company_el else "N/A",
+            location=loc_el.get_text(strip=True) if loc_el else "Remote",
+            job_type="full-time",
+            description=snippet_el.get_text(strip=True) if snippet_el else "",
+            application_url=f"https://www.indeed.com{link_el['href']}" if link_el and link_el.get("href") else "",
+            source="indeed",
+        ))
+    return jobs
+
+
+def time_parser(fn, page: str, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(page)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+async def max_loop_stall(work) -> float:
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, time.perf_counter() - before - 0.001)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    await work()
+    done = True
+    await tick
+    return worst * 1000
+
+
+async def stalls(page: str, pages: int):
+    async def inline():
+        for _ in range(pages):
+            legacy_parse(page)
+            await asyncio.sleep(0)
+
+    async def off_loop():
+        await asyncio.gather(*[parse_indeed_results(page) for _ in range(pages)])
+
+    await parse_indeed_results(page)  # warm the worker pool
+    return await max_loop_stall(inline), await max_loop_stall(off_loop)
+
+
+def main(rounds: int = 20, burst: int = 8):
+    with open(FIXTURE) as f:
+        page = f.read()
+
+    legacy_jobs, new_jobs = legacy_parse(page), parse_indeed_html(page)
+    assert legacy_jobs == new_jobs, "parsers disagree on the fixture"
+    print(f"fixture: {len(page) // 1024} KiB, {len(new_jobs)} cards")
+
+    legacy_ms = time_parser(legacy_parse, page, rounds)
+    lxml_ms = time_parser(parse_indeed_html, page, rounds)
+    print(f"legacy bs4 parse:   {legacy_ms:8.2f} ms/page")
+    print(f"compiled lxml parse:{lxml_ms:8.2f} ms/page  ({legacy_ms / lxml_ms:.1f}x)")
+
+    inline_stall, executor_stall = asyncio.run(stalls(page, burst))
+    shutdown_parser_executor()
+    print(f"max loop stall, {burst} pages inline:        {inline_stall:8.2f} ms")
+    print(f"max loop stall, {burst} pages via executor:  {executor_stall:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Compare LLM job scoring with and without the lexical pre-ranking stage.
+
+The OpenAI client is replaced by a fake with fixed latency and a concurrency
+cap (standing in for rate limits), so the numbers show call count and wall
+time, not model quality. The fake scores a job 90 when "python" is among its
+requirements and 40 otherwise, as a stand-in for relevance. The "legacy" path scores the first 20 candidates in
+corpus order, as batch_score_jobs did before pre-ranking. The last row scores
+the same shortlist with several jobs per request.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_prerank
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from types import SimpleNamespace
+
+from bs4 import BeautifulSoup
+
+from app.agents.job_matcher import JobMatcherAgent
+from app.agents.lexical_ranker import rank_jobs
+from app.config import settings
+from app.scrapers.scraped_job import ScrapedJob
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "remoteok_feed.json")
+LLM_LATENCY = 0.8
+LLM_CONCURRENCY = 4
+
+
+def fake_score(text):
+    requirements = text.lower().split("requirements:", 1)[-1].split("\n", 1)[0]
+    score = 90 if "python" in requirements else 40
+    return {"match_score": score, "match_reasons": [], "missing_skills": [], "summary": ""}
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+        self._slots = asyncio.Semaphore(LLM_CONCURRENCY)
+
+    async def create(self, **kwargs):
+        async with self._slots:
+            self.calls += 1
+            await asyncio.sleep(LLM_LATENCY)
+        prompt = kwargs["messages"][0]["content"]
+        sections = re.split(r"### Job ID: (\S+)", prompt)
+        if len(sections) > 1:
+            jobs = zip(sections[1::2], sections[2::2])
+            content = json.dumps({"results": [dict(fake_score(text), job_id=job_id) for job_id, text in jobs]})
+        else:
+            content = json.dumps(fake_score(prompt))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def load_jobs():
+    with open(FIXTURE) as f:
+        feed = json.load(f)[1:]
+    return [
+        ScrapedJob(
+            title=item["position"],
+            company=item["company"],
+            location=item["location"],
+            job_type="remote",
+            description=BeautifulSoup(item["description"], "lxml").get_text()[:1000],
+            application_url=item["url"],
+            source="remoteok",
+            requirements=item["tags"],
+        )
+        for item in feed
+    ]
+
+
+async def run(jobs, profile, resume_text, shortlist_k, batch_size=1):
+    settings.MATCHER_BATCH_SIZE = batch_size
+    completions = FakeCompletions()
+    matcher = JobMatcherAgent()
+    matcher.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    start = time.perf_counter()
+    results = await matcher.batch_score_jobs(jobs, profile, resume_text, top_n=10, shortlist_k=shortlist_k)
+    return time.perf_counter() - start, completions.calls, results
+
+
+async def main():
+    jobs = load_jobs()
+    profile = SimpleNamespace(
+        domain="backend",
+        experience_level="fresher",
+        skills=["Python", "FastAPI", "PostgreSQL", "Docker"],
+        target_roles=["Backend Engineer"],
+        projects=[],
+    )
+    resume_text = "Built REST APIs with Python and FastAPI, deployed with Docker on AWS. PostgreSQL, Redis."
+
+    start = time.perf_counter()
+    rank_jobs(jobs, profile, resume_text)
+    rank_ms = (time.perf_counter() - start) * 1000
+
+    # Legacy path: first 20 jobs in corpus order, every one sent to the LLM.
+    legacy_s, legacy_calls, legacy = await run(jobs[:20], profile, resume_text, shortlist_k=20)
+    ranked_s, ranked_calls, ranked = await run(jobs, profile, resume_text, shortlist_k=8)
+    batched_s, batched_calls, batched = await run(jobs, profile, resume_text, shortlist_k=8, batch_size=4)
+
+    def strong(results):
+        return sum(1 for r in results if r["match_score"] >= 80)
+
+    print(f"corpus: {len(jobs)} jobs, BM25 pre-rank: {rank_ms:.1f} ms")
+    print(f"{'path':<22}{'LLM calls':>10}{'wall s':>9}{'strong in top 10':>18}")
+    print(f"{'legacy jobs[:20]':<22}{legacy_calls:>10}{legacy_s:>9.2f}{strong(legacy):>18}")
+    print(f"{'BM25 shortlist K=8':<22}{ranked_calls:>10}{ranked_s:>9.2f}{strong(ranked):>18}")
+    print(f"{'K=8, 4 jobs/request':<22}{batched_calls:>10}{batched_s:>9.2f}{strong(batched):>18}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""Compare the legacy RemoteOK tag/skill filter with the compiled FeedMatcher.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_remoteok_matcher
+"""
+import json
+import os
+import time
+
+from app.scrapers.matcher import get_feed_matcher
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "remoteok_feed.json")
+
+CASES = [
+    ("data_science", ["data", "analytics", "analyst", "bi", "sql", "data-science", "data-analyst", "data-engineer"],
+     ["Pandas", "Tableau", "Spark", "Excel", "Looker"]),
+    ("backend", ["backend", "python", "node", "java", "golang"],
+     ["Kafka", "Redis", "GraphQL", "Rust", "Scala"]),
+    ("ui_ux", ["design", "ui", "ux", "figma", "product-design"],
+     ["Sketch", "Illustrator", "Prototyping", "Research", "Webflow"]),
+]
+
+
+def legacy_filter(feed, tags, skills):
+    matched = 0
+    for item in feed:
+        if not isinstance(item, dict) or "position" not in item:
+            continue
+        job_tags = [t.lower() for t in item.get("tags", [])]
+        if not any(tag in job_tags for tag in tags):
+            if skills:
+                if not any(s.lower() in str(item).lower() for s in skills[:5]):
+                    continue
+            else:
+                continue
+        matched += 1
+    return matched
+
+
+def compiled_filter(feed, tags, skills):
+    matcher = get_feed_matcher(tags, skills[:5])
+    matched = 0
+    for item in feed:
+        if not isinstance(item, dict) or "position" not in item:
+            continue
+        if matcher.matches(item):
+            matched += 1
+    return matched
+
+
+def bench(fn, feed, tags, skills, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        matched = fn(feed, tags, skills)
+    return (time.perf_counter() - start) / rounds * 1000, matched
+
+
+def main(rounds: int = 20):
+    with open(FIXTURE) as f:
+        feed = json.load(f)
+    print(f"feed items: {len(feed) - 1}, rounds: {rounds}")
+    print(f"{'domain':<14}{'legacy ms':>12}{'compiled ms':>14}{'speedup':>10}{'matched':>14}")
+    for domain, tags, skills in CASES:
+        legacy_ms, legacy_n = bench(legacy_filter, feed, tags, skills, rounds)
+        compiled_ms, compiled_n = bench(compiled_filter, feed, tags, skills, rounds)
+        print(f"{domain:<14}{legacy_ms:>12.2f}{compiled_ms:>14.2f}{legacy_ms / compiled_ms:>9.1f}x{legacy_n:>7}/{compiled_n:<6}")
+
+
+if __name__ == "__main__":
+    main()
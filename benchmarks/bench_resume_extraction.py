@@ -0,0 +1,145 @@
+"""Measure resume text extraction: serial vs page-parallel parsing, the
+content-hash cache, and how long the event loop stays blocked meanwhile.
+
+Fixture PDFs (2, 10 and 30 pages of dense text) and a DOCX are written by
+small writers in this file, so no document-generation dependency is needed.
+For each PDF the benchmark reports a serial whole-document pdfplumber parse on
+the loop (what the request handler used to do), the page-parallel cold
+extraction, and a repeated extraction served from the on-disk cache. The
+30-page fixture is above RESUME_EXTRACT_MAX_PAGES, so only the capped prefix
+is parsed. "Max loop stall" is the largest gap seen by a 5 ms ticker running
+alongside the extraction.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_resume_extraction
+"""
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+
+import pdfplumber
+from loguru import logger
+
+from app.agents import resume_extraction
+from app.agents.resume_extraction import ExtractedTextCache, extract_resume_text
+
+PAGE_COUNTS = [2, 10, 30]
+DOCX_PARAGRAPHS = 2000
+LINES_PER_PAGE = 48
+WORDS = (
+    "python fastapi kubernetes led team delivered reduced latency built pipeline "
+    "analytics customers revenue improved designed deployed react sql aws docker "
+    "mentored interns automated testing migrated services scaled throughput"
+).split()
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, pages: int, rng: random.Random):
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for _ in range(pages):
+        lines = [" ".join(rng.choices(WORDS, k=12)) for _ in range(LINES_PER_PAGE)]
+        body = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"({_escape(line)}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(body)} >>\nstream\n{body}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(path: str, paragraphs: int, rng: random.Random):
+    body = "".join(
+        f"<w:p><w:r><w:t>{' '.join(rng.choices(WORDS, k=14))}</w:t></w:r></w:p>" for _ in range(paragraphs)
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", document)
+
+
+async def _timed_with_stall(coro):
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            stall = max(stall, now - last - 0.005)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    done = True
+    await tick
+    return elapsed * 1000, stall * 1000
+
+
+async def _serial_inline(path: str):
+    with pdfplumber.open(path) as pdf:
+        "\n".join(page.extract_text() or "" for page in pdf.pages)
+
+
+async def main():
+    logger.remove()
+    rng = random.Random(0)
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    resume_extraction.extracted_text_cache = ExtractedTextCache(os.path.join(workdir, "cache"))
+    try:
+        print(f"{'fixture':<12}{'mode':<18}{'time':>10}{'max loop stall':>18}")
+        for pages in PAGE_COUNTS:
+            path = os.path.join(workdir, f"resume_{pages}p.pdf")
+            write_pdf(path, pages, rng)
+            # Warm the worker pool so the cold number is parse time, not process spawn.
+            await extract_resume_text(path, content_hash=f"warmup-{pages}")
+            rows = [
+                ("serial inline", await _timed_with_stall(_serial_inline(path))),
+                ("parallel cold", await _timed_with_stall(extract_resume_text(path))),
+                ("cached", await _timed_with_stall(extract_resume_text(path))),
+            ]
+            for mode, (elapsed, stall) in rows:
+                print(f"{f'{pages} pages':<12}{mode:<18}{elapsed:>8.1f} ms{stall:>15.1f} ms")
+
+        path = os.path.join(workdir, "resume.docx")
+        write_docx(path, DOCX_PARAGRAPHS, rng)
+        for mode in ("cold", "cached"):
+            elapsed, stall = await _timed_with_stall(extract_resume_text(path))
+            print(f"{'docx':<12}{mode:<18}{elapsed:>8.1f} ms{stall:>15.1f} ms")
+    finally:
+        resume_extraction.shutdown_extraction_executor()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+"""Measure the skills-gap analytics over a synthetic corpus of 100k jobs.
+
+Jobs draw 4-12 skills from a Zipf-like distribution over a 2,000-skill
+vocabulary and are spread over 15 domains and the last 8 weeks. The query
+numbers are what /api/analytics/skills-gap spends per request once the
+matrix is built; the build runs in the background on a TTL.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_skill_analytics
+"""
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.utils.skill_analytics import SkillMatrix
+
+CORPUS_SIZE = 100_000
+VOCABULARY = [f"skill-{i}" for i in range(2000)]
+DOMAINS = [f"domain_{i}" for i in range(15)]
+QUERIES = 200
+
+
+def synthetic_rows(rng):
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    now = datetime.now(timezone.utc)
+    for _ in range(CORPUS_SIZE):
+        tags = rng.choices(VOCABULARY, weights=weights, k=rng.randint(4, 12))
+        yield rng.choice(DOMAINS), tags, now - timedelta(days=rng.randint(0, 55))
+
+
+def main():
+    rng = random.Random(0)
+    rows = list(synthetic_rows(rng))
+
+    start = time.perf_counter()
+    matrix = SkillMatrix(rows)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    users = [(rng.choice(DOMAINS), rng.sample(VOCABULARY[:200], 8)) for _ in range(QUERIES)]
+    start = time.perf_counter()
+    for domain, skills in users:
+        matrix.skills_gap(domain, skills, top=10)
+        matrix.domain_trends()
+    query_ms = (time.perf_counter() - start) * 1000 / QUERIES
+
+    print(f"corpus: {matrix.job_count} jobs x {len(matrix.skills)} skills, {len(matrix.indices)} non-zeros")
+    print(f"{'matrix build':<24}{build_ms:>10.0f} ms")
+    print(f"{'per-user query':<24}{query_ms:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import time
+from app.scrapers.circuit_breaker import CircuitBreaker, CircuitState, SourceUnavailableError
+
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    return CircuitBreaker("test", failure_threshold=3, base_backoff=10, max_backoff=60, **kwargs)
+
+
+def _expire(breaker: CircuitBreaker):
+    breaker.open_until = time.monotonic() - 1
+
+
+def test_stays_closed_below_threshold():
+    breaker = _breaker()
+    breaker.record_failure(RuntimeError("boom"))
+    breaker.record_failure(RuntimeError("boom"))
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_success_resets_failure_count():
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.failures == 1
+
+
+def test_opens_at_threshold_and_rejects_requests():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure(RuntimeError("boom"))
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.last_error == "boom"
+    assert not breaker.allow_request()
+    assert breaker.status()["retry_in_seconds"] > 0
+
+
+def test_half_open_admits_a_single_probe():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    _expire(breaker)
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+
+def test_successful_probe_closes_the_circuit():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    _expire(breaker)
+    assert breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.trips == 0
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_with_longer_backoff():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    _expire(breaker)
+    assert breaker.allow_request()
+
+    before = time.monotonic()
+    breaker.record_failure(RuntimeError("still down"))
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.trips == 2
+    # Second trip backs off between 10 and 20 seconds (base 10, doubled, jittered down to half).
+    assert 10 <= breaker.open_until - before <= 20 + 0.1
+    assert not breaker.allow_request()
+
+
+def test_released_probe_lets_the_next_caller_probe():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    _expire(breaker)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.release_probe()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_retry_after_extends_the_open_window_up_to_max_backoff():
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    before = time.monotonic()
+    breaker.record_failure(SourceUnavailableError("test", 429, retry_after=45))
+    assert 45 <= breaker.open_until - before <= 45 + 0.1
+
+    _expire(breaker)
+    assert breaker.allow_request()
+    before = time.monotonic()
+    breaker.record_failure(SourceUnavailableError("test", 503, retry_after=3600))
+    assert breaker.open_until - before <= 60 + 0.1
@@ -0,0 +1,58 @@
+import json
+import pytest
+from app.scrapers.feed_stream import iter_json_array, read_chunks
+
+PAYLOADS = [
+    b"[]",
+    b" \n[ ]\n",
+    b"[1, 2.5]",
+    b"[0,-1,1e5,3.25E-2 , 12345678901234567890,-0.5e-3]",
+    b"[true,false,null]",
+    b'["a", "quote \\" inside", "\\u00e9 escaped", "tab\\tnew\\nline"]',
+    '["café", "✓ multibyte", "\U0001f680"]'.encode("utf-8"),
+    b'[{"id": 1, "tags": ["python", "go"], "nested": {"a": [1, {"b": null}]}}, [], {}, ""]',
+    b'[{"legal": "RemoteOK terms"}, {"position": "Backend Engineer", "epoch": 1700000000, "salary_min": 0}]',
+]
+MALFORMED = [
+    b"[1 2]", b"[1,2", b'{"a": 1}', b"[1.]", b'["unterminated]', b"[tru]",
+    b"[,1]", b"[1,,2]", b"[1,]", b"[,]", b"[ , ]",
+]
+
+
+def _chunks(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_matches_json_loads_at_every_chunk_size(payload):
+    expected = json.loads(payload)
+    for size in range(1, len(payload) + 1):
+        assert list(iter_json_array(_chunks(payload, size))) == expected, f"chunk size {size}"
+
+
+@pytest.mark.parametrize("payload", MALFORMED)
+def test_malformed_input_raises_at_every_chunk_size(payload):
+    for size in range(1, len(payload) + 1):
+        with pytest.raises(ValueError):
+            list(iter_json_array(_chunks(payload, size)))
+
+
+def test_items_are_yielded_before_the_feed_is_fully_read():
+    consumed = []
+
+    def chunks():
+        for chunk in (b'[{"a": 1},', b' {"b": 2}', b"]"):
+            consumed.append(chunk)
+            yield chunk
+
+    items = iter_json_array(chunks())
+    assert next(items) == {"a": 1}
+    assert consumed == [b'[{"a": 1},']
+    assert list(items) == [{"b": 2}]
+
+
+def test_reads_a_file_in_chunks(tmp_path):
+    feed = [{"id": i, "position": f"Engineer {i}", "tags": ["x" * i]} for i in range(200)]
+    path = tmp_path / "feed.json"
+    path.write_text(json.dumps(feed))
+    assert list(iter_json_array(read_chunks(str(path), chunk_size=7))) == feed
@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from app.scrapers import job_scraper
+from app.scrapers.job_scraper import JobScraper
+from app.scrapers.single_flight import SingleFlight
+
+
+class RecordingScraper:
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    async def search(self, *args):
+        self.calls.append(args)
+        await self.release.wait()
+        return []
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setattr(job_scraper, "search_flight", SingleFlight(ttl_seconds=0))
+    scraper = JobScraper(http_client=object())
+    scraper.remoteok = RecordingScraper()
+    scraper.indeed = RecordingScraper()
+    return scraper
+
+
+async def _search_concurrently(scraper, *skill_lists):
+    searches = [asyncio.create_task(scraper.search_jobs("backend", skills)) for skills in skill_lists]
+    await asyncio.sleep(0.01)
+    scraper.remoteok.release.set()
+    scraper.indeed.release.set()
+    await asyncio.gather(*searches)
+    return [call[1] for call in scraper.remoteok.calls]
+
+
+@pytest.mark.asyncio
+async def test_different_matcher_skills_do_not_share_a_search(scraper):
+    # Same set of six skills, but the RemoteOK matcher only sees the first five.
+    skills = await _search_concurrently(
+        scraper,
+        ["python", "aws", "docker", "sql", "git", "rust"],
+        ["python", "rust", "aws", "docker", "sql", "git"],
+    )
+    assert len(skills) == 2
+
+
+@pytest.mark.asyncio
+async def test_skill_order_within_the_matched_five_is_part_of_the_key(scraper):
+    skills = await _search_concurrently(scraper, ["python", "aws"], ["aws", "python"])
+    assert len(skills) == 2
+
+
+@pytest.mark.asyncio
+async def test_identical_effective_skills_share_a_search(scraper):
+    skills = await _search_concurrently(
+        scraper,
+        ["Python", "AWS", "docker", "sql", "git", "rust"],
+        ["python", "aws", "Docker", "SQL", "git", "haskell"],
+    )
+    assert len(skills) == 1
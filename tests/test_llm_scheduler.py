@@ -0,0 +1,135 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import httpx
+import openai
+import pytest
+from app.agents.llm_scheduler import LLMScheduler, Priority, _retry_after
+
+
+def _rate_limit_error(headers: dict) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class FakeClient:
+    # Records the order calls reach the API. A call whose model is in `hold` waits
+    # for release; queued errors are raised by the next calls, one each.
+    def __init__(self, hold=(), errors=()):
+        self.calls = []
+        self.started_at = []
+        self.hold = set(hold)
+        self.errors = list(errors)
+        self.release = asyncio.Event()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model: str, **kwargs):
+        self.calls.append(model)
+        self.started_at.append(time.monotonic())
+        if model in self.hold:
+            await self.release.wait()
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(model=model, usage=SimpleNamespace(total_tokens=10))
+
+
+def _scheduler(**kwargs) -> LLMScheduler:
+    kwargs.setdefault("max_retries", 0)
+    return LLMScheduler(requests_per_minute=100000, tokens_per_minute=10 ** 8, max_concurrency=1, **kwargs)
+
+
+async def _until(predicate):
+    while not predicate():
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_waiting_calls_are_granted_in_priority_order():
+    scheduler = _scheduler()
+    client = FakeClient(hold={"running"})
+    running = asyncio.create_task(scheduler.chat(client, Priority.BACKGROUND, model="running", messages=[]))
+    await _until(lambda: client.calls)
+
+    queued = []
+    for name, priority in [
+        ("background", Priority.BACKGROUND),
+        ("default", Priority.DEFAULT),
+        ("interactive-1", Priority.INTERACTIVE),
+        ("interactive-2", Priority.INTERACTIVE),
+    ]:
+        queued.append(asyncio.create_task(scheduler.chat(client, priority, model=name, messages=[])))
+    await _until(lambda: scheduler.stats()["queued"] == 4)
+
+    client.release.set()
+    await asyncio.gather(running, *queued)
+    assert client.calls == ["running", "interactive-1", "interactive-2", "default", "background"]
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_holds_back_queued_calls():
+    scheduler = _scheduler()
+    client = FakeClient(hold={"first"})
+    first = asyncio.create_task(scheduler.chat(client, model="first", messages=[]))
+    await _until(lambda: client.calls)
+    second = asyncio.create_task(scheduler.chat(client, Priority.INTERACTIVE, model="second", messages=[]))
+    await _until(lambda: scheduler.stats()["queued"] == 1)
+    await asyncio.sleep(0.01)
+    assert client.calls == ["first"]
+
+    client.release.set()
+    await asyncio.gather(first, second)
+    assert client.calls == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_retries_after_the_server_delay():
+    scheduler = _scheduler(max_retries=2)
+    client = FakeClient(errors=[_rate_limit_error({"retry-after-ms": "200"})])
+
+    response = await scheduler.chat(client, model="gpt", messages=[])
+    assert response.model == "gpt"
+    assert client.calls == ["gpt", "gpt"]
+    assert client.started_at[1] - client.started_at[0] >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_other_callers_too():
+    scheduler = LLMScheduler(requests_per_minute=100000, tokens_per_minute=10 ** 8, max_concurrency=2, max_retries=1)
+    client = FakeClient(errors=[_rate_limit_error({"retry-after": "1"})])
+    limited = asyncio.create_task(scheduler.chat(client, model="limited", messages=[]))
+    await _until(lambda: scheduler.stats()["paused_for_seconds"] > 0)
+
+    # A free slot is available, but the whole scheduler waits out the server's delay.
+    other = await scheduler.chat(client, model="other", messages=[])
+    await limited
+    assert other.model == "other"
+    assert client.calls[0] == "limited"
+    assert client.started_at[client.calls.index("other")] - client.started_at[0] >= 1.0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_raised_once_retries_are_exhausted():
+    scheduler = _scheduler(max_retries=0)
+    client = FakeClient(errors=[_rate_limit_error({"retry-after-ms": "0"})])
+    with pytest.raises(openai.RateLimitError):
+        await scheduler.chat(client, model="gpt", messages=[])
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_are_not_retried():
+    scheduler = _scheduler(max_retries=3)
+    client = FakeClient(errors=[ValueError("bad request")])
+    with pytest.raises(ValueError):
+        await scheduler.chat(client, model="gpt", messages=[])
+    assert client.calls == ["gpt"]
+
+
+def test_retry_after_header_forms():
+    assert _retry_after(_rate_limit_error({"retry-after-ms": "1500"})) == 1.5
+    assert _retry_after(_rate_limit_error({"retry-after": "7"})) == 7.0
+    assert 0 < _retry_after(_rate_limit_error({"retry-after": "Wed, 21 Oct 2099 07:28:00 GMT"}))
+    assert _retry_after(_rate_limit_error({})) is None
+    assert _retry_after(ValueError("no response")) is None
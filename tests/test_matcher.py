@@ -0,0 +1,37 @@
+from app.scrapers.matcher import FeedMatcher, SkillAutomaton
+
+
+def test_matches_whole_words_only():
+    automaton = SkillAutomaton(["go", "java"])
+    assert automaton.find_all("Go and JavaScript, golang") == {"go"}
+
+
+def test_prefers_the_longest_pattern():
+    automaton = SkillAutomaton(["react", "react native"])
+    assert automaton.find_all("built apps in React  Native") == {"react native"}
+
+
+def test_falls_back_to_a_shorter_pattern_when_the_longest_ends_mid_word():
+    automaton = SkillAutomaton(["react", "react native"])
+    assert automaton.find_all("we use react nativescript") == {"react"}
+
+
+def test_fallback_tries_every_shorter_pattern_from_the_same_start():
+    automaton = SkillAutomaton(["machine", "machine learning", "machine learning ops"])
+    assert automaton.find_all("machine learning opsx") == {"machine learning"}
+    assert automaton.find_all("machine learningx") == {"machine"}
+
+
+def test_no_fallback_when_the_match_starts_inside_a_word():
+    automaton = SkillAutomaton(["react", "react native"])
+    assert automaton.find_all("preact nativescript") == set()
+
+
+def test_symbols_in_patterns_and_boundaries():
+    automaton = SkillAutomaton(["c", "c++", "c#"])
+    assert automaton.find_all("c++, c# and c") == {"c++", "c#", "c"}
+
+
+def test_feed_matcher_uses_the_shorter_skill():
+    matcher = FeedMatcher(tags=[], skills=["react", "react native"])
+    assert matcher.matches({"position": "Engineer", "description": "react nativescript apps", "tags": []})
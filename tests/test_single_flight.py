@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from app.scrapers.single_flight import SingleFlight
+
+
+class Work:
+    def __init__(self, result="done"):
+        self.result = result
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight(ttl_seconds=0)
+    work = Work()
+    callers = [asyncio.create_task(flight.do("key", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    work.release.set()
+
+    assert await asyncio.gather(*callers) == ["done"] * 5
+    assert work.calls == 1
+    assert flight.stats() == {"executions": 1, "shared": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    flight = SingleFlight(ttl_seconds=0)
+    work = Work()
+    work.release.set()
+    await asyncio.gather(flight.do("a", work), flight.do("b", work))
+    assert work.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_work():
+    flight = SingleFlight(ttl_seconds=0)
+    work = Work()
+    first = asyncio.create_task(flight.do("key", work))
+    second = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    work.release.set()
+
+    assert await second == "done"
+    assert work.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_work_keeps_running_after_every_caller_is_cancelled():
+    flight = SingleFlight(ttl_seconds=60)
+    work = Work()
+    caller = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    work.release.set()
+    assert await flight.do("key", work) == "done"
+    assert work.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_but_not_cached():
+    flight = SingleFlight(ttl_seconds=60)
+    work = Work(RuntimeError("boom"))
+    callers = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+    await asyncio.sleep(0)
+    work.release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert work.calls == 1
+
+    work.result = "recovered"
+    assert await flight.do("key", work) == "recovered"
+    assert work.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_results_are_reused_within_ttl():
+    flight = SingleFlight(ttl_seconds=60)
+    work = Work()
+    work.release.set()
+    assert await flight.do("key", work) == "done"
+    assert await flight.do("key", work) == "done"
+    assert work.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_only_coalesces_in_flight_calls():
+    flight = SingleFlight(ttl_seconds=0)
+    work = Work()
+    work.release.set()
+    await flight.do("key", work)
+    await flight.do("key", work)
+    assert work.calls == 2